@@ -0,0 +1,187 @@
+"""
+Maghrib Spike Load Profile
+Simulates the iftar rush against the Ramadan tables and the regular lookup path
+
+Run from the prayer_times_bot directory:
+    python benchmarks/maghrib_spike.py --users 5000 --window 5
+
+AlAdhan is replaced by a synthetic upstream with fixed latency, so the run
+is offline and the reported upstream call counts are exact.
+"""
+import argparse
+import asyncio
+import calendar
+import os
+import random
+import sys
+import time
+from datetime import date as date_type, timedelta
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("BOT_TOKEN", "benchmark")
+os.environ["DISK_CACHE_PATH"] = ""
+
+from config import CACHE_MAX_ENTRIES, POLISH_CITIES, RAMADAN_HOT_CELLS  # noqa: E402
+from services.aladhan_api import api  # noqa: E402
+from services.cache import LRUCache  # noqa: E402
+from services.formatter import formatter  # noqa: E402
+from services.metrics import metrics  # noqa: E402
+from services.ramadan import RamadanSchedule  # noqa: E402
+
+FIRST_DAY = date_type(2027, 2, 8)
+LAST_DAY = date_type(2027, 3, 9)
+
+_TIMINGS = {
+    "Fajr": "05:10",
+    "Sunrise": "07:00",
+    "Dhuhr": "12:15",
+    "Asr": "14:50",
+    "Maghrib": "17:20",
+    "Isha": "19:00",
+}
+
+
+class SyntheticUpstream:
+    """Stand-in for AlAdhan responses with a fixed round trip time"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def __call__(self, url: str, params: dict):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if "/calendar/" in url:
+            year, month = map(int, url.rstrip("/").split("/")[-2:])
+            return [
+                {
+                    "timings": _TIMINGS,
+                    "date": {"gregorian": {"day": str(day), "date": f"{day:02d}-{month:02d}-{year}"}},
+                }
+                for day in range(1, calendar.monthrange(year, month)[1] + 1)
+            ]
+        return {"timings": _TIMINGS, "date": {"gregorian": {"date": url.rstrip("/").split("/")[-1]}}}
+
+
+def _reset_caches() -> None:
+    api.day_cache = LRUCache(CACHE_MAX_ENTRIES)
+    api.month_cache = LRUCache(CACHE_MAX_ENTRIES)
+    metrics.reset()
+
+
+def _locations(users: int, city_share: float) -> List[Tuple[float, float, str]]:
+    """Users in listed cities plus users sharing coordinates around them"""
+    cities = list(POLISH_CITIES.items())
+    locations = []
+    for _ in range(users):
+        city, (latitude, longitude) = random.choice(cities)
+        if random.random() < city_share:
+            locations.append((latitude, longitude, city))
+        else:
+            locations.append((
+                latitude + random.uniform(-0.3, 0.3),
+                longitude + random.uniform(-0.3, 0.3),
+                None,
+            ))
+    return locations
+
+
+def _arrivals(users: int, window: float) -> List[float]:
+    """Request offsets: most users open the bot in the minutes right before Maghrib"""
+    peak = window * 0.8
+    offsets = []
+    for _ in range(users):
+        if random.random() < 0.8:
+            offsets.append(min(max(random.gauss(peak, window * 0.05), 0.0), window))
+        else:
+            offsets.append(random.uniform(0, window))
+    return offsets
+
+
+async def _run_profile(
+    name: str,
+    request: Callable,
+    locations: List[Tuple[float, float, str]],
+    offsets: List[float],
+    upstream: SyntheticUpstream
+) -> None:
+    latencies: List[float] = []
+    calls_before = upstream.calls
+
+    async def user(location, offset: float) -> None:
+        await asyncio.sleep(offset)
+        started = time.perf_counter()
+        await request(*location)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(location, offset) for location, offset in zip(locations, offsets)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(value: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * value))] * 1000
+
+    print(
+        f"{name:<10} requests={len(latencies)} wall={elapsed:.1f}s "
+        f"upstream={upstream.calls - calls_before} "
+        f"p50={percentile(0.5):.2f}ms p95={percentile(0.95):.2f}ms "
+        f"p99={percentile(0.99):.2f}ms max={latencies[-1] * 1000:.2f}ms"
+    )
+    if metrics.counters:
+        print(f"{'':<10} {metrics.summary()}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    random.seed(args.seed)
+    upstream = SyntheticUpstream(args.upstream_latency)
+    api._get_data = upstream
+
+    day = FIRST_DAY + timedelta(days=args.day - 1)
+    locations = _locations(args.users, args.city_share)
+    offsets = _arrivals(args.users, args.window)
+
+    # Regular path: daily lookups through the shared caches, nothing precomputed
+    _reset_caches()
+
+    async def regular(latitude: float, longitude: float, city: str) -> None:
+        timings = await api.get_timings_by_coordinates(latitude, longitude, date=day)
+        formatter.format_daily_times(timings, city=city)
+
+    await _run_profile("regular", regular, locations, offsets, upstream)
+
+    # Ramadan mode: tables built ahead of time from the previous days' hot cells
+    _reset_caches()
+    schedule = RamadanSchedule(FIRST_DAY, LAST_DAY, hot_cells=args.hot_cells)
+    calls_before = upstream.calls
+    started = time.perf_counter()
+    tables = await schedule.precompute()
+    print(
+        f"precompute tables={tables} upstream={upstream.calls - calls_before} "
+        f"took={time.perf_counter() - started:.1f}s"
+    )
+    metrics.reset()
+
+    async def surge(latitude: float, longitude: float, city: str) -> None:
+        await schedule.get_message(latitude, longitude, day, city=city)
+
+    await _run_profile("ramadan", surge, locations, offsets, upstream)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=5000, help="Requests in the spike")
+    parser.add_argument("--window", type=float, default=5.0, help="Spike length in seconds (time-compressed)")
+    parser.add_argument("--city-share", type=float, default=0.7, help="Share of users picking a listed city")
+    parser.add_argument(
+        "--hot-cells",
+        type=int,
+        default=RAMADAN_HOT_CELLS,
+        help="Location cells precomputed besides cities"
+    )
+    parser.add_argument("--upstream-latency", type=float, default=0.2, help="Synthetic AlAdhan round trip, seconds")
+    parser.add_argument("--day", type=int, default=15, help="Day of Ramadan to simulate")
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
@@ -7,13 +7,43 @@ Based on Muslim World League calculation method (Fajr: 18°, Isha: 17°)
 """
 import asyncio
 import logging
+import ssl
 import sys
+from typing import Optional
+
+import aiogram
+import certifi
+from aiohttp import ClientSession, TCPConnector
+from aiohttp.hdrs import USER_AGENT
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
 from aiogram.enums import ParseMode
 
-from config import BOT_TOKEN
-from handlers import start, prayer_times
+from config import (
+    BOT_TOKEN,
+    WARMER_ENABLED,
+    DIGEST_ENABLED,
+    HTTP_API_ENABLED,
+    TELEGRAM_POOL_SIZE,
+    TELEGRAM_KEEPALIVE_SECONDS,
+    TELEGRAM_TIMEOUT_SECONDS,
+    MESSAGE_CONCURRENCY,
+    CALLBACK_CONCURRENCY,
+    INLINE_CONCURRENCY,
+    HANDLER_QUEUE_SIZE,
+)
+from handlers import start, prayer_times, settings, export, ramadan as ramadan_handlers, subscriptions as subscription_handlers
+from middlewares.concurrency import ConcurrencyLimitMiddleware
+from middlewares.telemetry import TelegramTelemetryMiddleware
+from services.aladhan_api import api
+from services.metrics import metrics
+from services.broadcast import DigestBroadcaster
+from services.http_api import http_api
+from services.ramadan import ramadan
+from services.subscriptions import subscriptions
+from services.user_prefs import user_prefs
+from services.warmer import warmer
 
 
 # Configure logging
@@ -29,6 +59,67 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class KeepAliveSession(AiohttpSession):
+    """
+    AiohttpSession with its own connection pool and keep-alive timeout
+
+    aiogram builds the aiohttp client in create_session(); this override
+    owns the client instead of tuning aiogram's private connector settings.
+    Proxies are not supported.
+    """
+
+    def __init__(self, limit: int, keepalive_timeout: float, **kwargs):
+        """
+        Initialize session
+
+        Args:
+            limit: Maximum simultaneous connections to the Bot API
+            keepalive_timeout: Seconds an idle connection is kept open
+            **kwargs: BaseSession options (timeout, api, ...)
+        """
+        super().__init__(limit=limit, **kwargs)
+        self.limit = limit
+        self.keepalive_timeout = keepalive_timeout
+        self._client: Optional[ClientSession] = None
+
+    async def create_session(self) -> ClientSession:
+        if self._client is None or self._client.closed:
+            self._client = ClientSession(
+                connector=TCPConnector(
+                    ssl=ssl.create_default_context(cafile=certifi.where()),
+                    limit=self.limit,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=3600,
+                ),
+                headers={USER_AGENT: f"aiogram/{aiogram.__version__}"},
+            )
+        return self._client
+
+    async def close(self) -> None:
+        await super().close()
+        if self._client is not None and not self._client.closed:
+            await self._client.close()
+        self._client = None
+
+
+def create_session() -> AiohttpSession:
+    """
+    Telegram client session with a sized connection pool and telemetry
+
+    Returns:
+        AiohttpSession reusing keep-alive connections to the Bot API
+    """
+    # Keep idle connections open longer than aiohttp's 15s default,
+    # so bursts after quiet periods skip the TLS handshake
+    session = KeepAliveSession(
+        limit=TELEGRAM_POOL_SIZE,
+        keepalive_timeout=TELEGRAM_KEEPALIVE_SECONDS,
+        timeout=TELEGRAM_TIMEOUT_SECONDS
+    )
+    session.middleware(TelegramTelemetryMiddleware())
+    return session
+
+
 async def main():
     """
     Main function to start the bot with production-ready error handling
@@ -40,6 +131,7 @@ async def main():
     # Initialize bot with default parse mode
     bot = Bot(
         token=BOT_TOKEN,
+        session=create_session(),
         default=DefaultBotProperties(
             parse_mode=ParseMode.HTML
         )
@@ -48,12 +140,32 @@ async def main():
     # Initialize dispatcher
     dp = Dispatcher()
 
+    # Bound concurrent handlers per update type, shedding load when saturated
+    dp.message.outer_middleware(
+        ConcurrencyLimitMiddleware("message", MESSAGE_CONCURRENCY, HANDLER_QUEUE_SIZE)
+    )
+    dp.edited_message.outer_middleware(
+        ConcurrencyLimitMiddleware("edited_message", MESSAGE_CONCURRENCY, HANDLER_QUEUE_SIZE, notify=False)
+    )
+    dp.callback_query.outer_middleware(
+        ConcurrencyLimitMiddleware("callback_query", CALLBACK_CONCURRENCY, HANDLER_QUEUE_SIZE)
+    )
+    dp.inline_query.outer_middleware(
+        ConcurrencyLimitMiddleware("inline_query", INLINE_CONCURRENCY, HANDLER_QUEUE_SIZE)
+    )
+
     # Register routers
     dp.include_router(start.router)
     dp.include_router(prayer_times.router)
+    dp.include_router(settings.router)
+    dp.include_router(export.router)
+    dp.include_router(ramadan_handlers.router)
+    dp.include_router(subscription_handlers.router)
 
     logger.info("Routers registered successfully")
 
+    broadcaster = DigestBroadcaster(bot)
+
     # Start bot with proper error handling for production
     try:
         logger.info("Bot is starting polling...")
@@ -62,6 +174,27 @@ async def main():
         # Drop pending updates on startup to avoid processing old messages
         await bot.delete_webhook(drop_pending_updates=True)
 
+        # Restore saved locations and calculation settings
+        await user_prefs.load()
+
+        # Prefetch today's timings for all cities in the background
+        if WARMER_ENABLED:
+            warmer.start()
+
+        # Log queue wait times and other metrics periodically
+        metrics.start_reporting()
+
+        # Send the morning schedule to subscribers every day
+        if DIGEST_ENABLED:
+            broadcaster.start()
+
+        # Precompute suhoor/iftar tables when Ramadan dates are configured
+        ramadan.start()
+
+        # Serve cached times to other local services
+        if HTTP_API_ENABLED:
+            await http_api.start()
+
         await dp.start_polling(
             bot,
             allowed_updates=dp.resolve_used_update_types(),
@@ -73,6 +206,16 @@ async def main():
         logger.error(f"Critical error during bot execution: {e}", exc_info=True)
         raise
     finally:
+        await metrics.stop_reporting()
+        logger.info(f"Metrics: {metrics.summary()}")
+        await http_api.stop()
+        await broadcaster.stop()
+        await ramadan.stop()
+        await warmer.stop()
+        subscriptions.close()
+        user_prefs.close()
+        if api.disk_cache is not None:
+            api.disk_cache.close()
         logger.info("Closing bot session...")
         await bot.session.close()
         logger.info("Bot stopped successfully")
@@ -2,6 +2,7 @@
 Configuration file for Prayer Times Telegram Bot
 """
 import os
+from datetime import datetime
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -15,6 +16,55 @@ if not BOT_TOKEN:
 # AlAdhan API Configuration
 ALADHAN_API_URL = os.getenv("ALADHAN_API_URL", "https://api.aladhan.com/v1")
 CALCULATION_METHOD = 3  # Muslim World League (Fajr: 18°, Isha: 17°)
+ASR_SCHOOL = 0  # Standard (Shafi'i, Maliki, Hanbali)
+
+# Calculation methods users can choose (AlAdhan ID: (name, parameters))
+CALCULATION_METHODS = {
+    3: ("Всемирная Мусульманская Лига", "Фаджр: 18°, Иша: 17°"),
+    2: ("ISNA (Северная Америка)", "Фаджр: 15°, Иша: 15°"),
+    5: ("Египетское управление", "Фаджр: 19.5°, Иша: 17.5°"),
+    4: ("Умм аль-Кура (Мекка)", "Фаджр: 18.5°, Иша: 90 мин"),
+    1: ("Университет Карачи", "Фаджр: 18°, Иша: 18°"),
+    13: ("Диянет (Турция)", "Фаджр: 18°, Иша: 17°"),
+    12: ("UOIF (Франция)", "Фаджр: 12°, Иша: 12°"),
+    15: ("Комитет наблюдения за луной", "Фаджр: 18°, Иша: 18°"),
+}
+
+# Asr juristic schools (AlAdhan ID: name)
+ASR_SCHOOLS = {
+    0: "Стандартный (Шафии, Малики, Ханбали)",
+    1: "Ханафи",
+}
+
+# Cache Configuration
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "5000"))
+LOCATION_CELL_DEGREES = 0.05  # Grid cell size for sharing cached timings (~5 km)
+DISK_CACHE_PATH = os.getenv("DISK_CACHE_PATH", "times_cache.db")  # Empty to disable
+DISK_CACHE_KEEP_DAYS = 1  # Past days kept on disk with their whole month (yesterday stays servable after restart)
+
+# Cache warm-up (startup and nightly before local midnight)
+WARMER_ENABLED = os.getenv("WARMER_ENABLED", "true").lower() == "true"
+WARMER_CONCURRENCY = int(os.getenv("WARMER_CONCURRENCY", "3"))
+WARMER_JITTER_SECONDS = float(os.getenv("WARMER_JITTER_SECONDS", "2.0"))
+WARMER_HOT_CELLS = int(os.getenv("WARMER_HOT_CELLS", "20"))  # Most requested location cells to warm
+WARMER_TOP_METHODS = int(os.getenv("WARMER_TOP_METHODS", "3"))  # Most requested method/school pairs to warm
+WARMER_LEAD_MINUTES = int(os.getenv("WARMER_LEAD_MINUTES", "10"))
+
+# Request handling
+REQUEST_DEBOUNCE_SECONDS = float(os.getenv("REQUEST_DEBOUNCE_SECONDS", "1.5"))
+MONTH_PAGE_DAYS = 10  # Days per page in the month view
+PLACEHOLDER_DELAY_SECONDS = float(os.getenv("PLACEHOLDER_DELAY_SECONDS", "0.5"))  # Show "⏳" only for slow fetches
+
+# Ramadan surge mode: suhoor/iftar tables precomputed for the whole month
+# Dates follow the local moon sighting announcement, e.g. RAMADAN_START=2027-02-08
+RAMADAN_START = os.getenv("RAMADAN_START", "")  # ISO date of the first fast, empty to disable
+RAMADAN_END = os.getenv("RAMADAN_END", "")  # ISO date of the last fast
+RAMADAN_PREPARE_DAYS = int(os.getenv("RAMADAN_PREPARE_DAYS", "1"))  # Precompute this many days before the start
+RAMADAN_HOT_CELLS = int(os.getenv("RAMADAN_HOT_CELLS", "2000"))  # Requested location cells precomputed besides cities
+
+# Calendar (.ics) export
+EXPORT_CACHE_ENTRIES = int(os.getenv("EXPORT_CACHE_ENTRIES", "50"))  # Generated yearly files kept in memory
+EXPORT_EVENT_MINUTES = 15  # Duration of each prayer event in the exported calendar
 
 # Polish Cities (Name: (latitude, longitude))
 POLISH_CITIES = {
@@ -33,6 +83,39 @@ POLISH_CITIES = {
 # Timezone
 POLAND_TIMEZONE = "Europe/Warsaw"
 
+# Update handling limits (per update type) and load shedding
+MESSAGE_CONCURRENCY = int(os.getenv("MESSAGE_CONCURRENCY", "20"))
+CALLBACK_CONCURRENCY = int(os.getenv("CALLBACK_CONCURRENCY", "20"))
+INLINE_CONCURRENCY = int(os.getenv("INLINE_CONCURRENCY", "10"))
+HANDLER_QUEUE_SIZE = int(os.getenv("HANDLER_QUEUE_SIZE", "100"))  # Waiting updates per type before "busy" replies
+
+# Telegram Bot API client session
+TELEGRAM_POOL_SIZE = int(os.getenv("TELEGRAM_POOL_SIZE", "64"))  # Simultaneous connections to api.telegram.org
+TELEGRAM_KEEPALIVE_SECONDS = float(os.getenv("TELEGRAM_KEEPALIVE_SECONDS", "60"))  # Idle connection reuse window
+TELEGRAM_TIMEOUT_SECONDS = float(os.getenv("TELEGRAM_TIMEOUT_SECONDS", "30"))  # Per request, added to long-poll wait
+
+# Metrics
+METRICS_LOG_INTERVAL = float(os.getenv("METRICS_LOG_INTERVAL", "300"))  # Seconds, 0 to disable
+
+# User preferences
+USER_PREFS_DB_PATH = os.getenv("USER_PREFS_DB_PATH", "user_prefs.db")
+
+# Daily digest broadcast
+SUBSCRIPTIONS_DB_PATH = os.getenv("SUBSCRIPTIONS_DB_PATH", "subscriptions.db")
+DIGEST_ENABLED = os.getenv("DIGEST_ENABLED", "true").lower() == "true"
+DIGEST_TIME = datetime.strptime(os.getenv("DIGEST_TIME", "06:00"), "%H:%M").time()  # Local time in POLAND_TIMEZONE
+DIGEST_BATCH_SIZE = int(os.getenv("DIGEST_BATCH_SIZE", "50"))  # Sends between progress checkpoints
+DIGEST_CONCURRENCY = int(os.getenv("DIGEST_CONCURRENCY", "10"))
+DIGEST_MESSAGES_PER_SECOND = float(os.getenv("DIGEST_MESSAGES_PER_SECOND", "25"))  # Telegram allows ~30/s
+DIGEST_CATCH_UP_HOURS = float(os.getenv("DIGEST_CATCH_UP_HOURS", "3"))  # Resume a missed digest only this long after DIGEST_TIME
+
+# Read-only HTTP API for other local services (mosque display, website widget)
+HTTP_API_ENABLED = os.getenv("HTTP_API_ENABLED", "false").lower() == "true"
+HTTP_API_HOST = os.getenv("HTTP_API_HOST", "127.0.0.1")
+HTTP_API_PORT = int(os.getenv("HTTP_API_PORT", "8080"))
+HTTP_API_RATE_PER_MINUTE = int(os.getenv("HTTP_API_RATE_PER_MINUTE", "60"))  # Per client address
+HTTP_API_MAX_AGE = int(os.getenv("HTTP_API_MAX_AGE", "3600"))  # Cache-Control max-age, seconds
+
 # Message formatting
 # Note: Telegram clients control font rendering, but we can use monospace formatting
 USE_MONOSPACE = True  # Use monospace blocks for aligned prayer times
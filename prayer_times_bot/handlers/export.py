@@ -0,0 +1,87 @@
+"""
+Export Handler
+Handles /export - a year of prayer times as a calendar file
+"""
+from aiogram import Router
+from aiogram.enums import ChatAction
+from aiogram.filters import Command, CommandObject
+from aiogram.types import Message, BufferedInputFile
+import logging
+
+from services.aladhan_api import AlAdhanAPIError
+from services.formatter import formatter
+from services.ics_export import ics_exporter
+from services.replies import fetch_with_placeholder
+from services.timezones import timezones
+from services.user_prefs import user_prefs
+from keyboards.main_keyboards import get_cities_keyboard
+
+logger = logging.getLogger(__name__)
+
+# Create router for export handlers
+router = Router()
+
+
+@router.message(Command("export"))
+async def cmd_export(message: Message, command: CommandObject):
+    """
+    Handle /export [year] command - send the year's schedule as an .ics file
+    for the user's last city or location
+
+    Args:
+        message: Telegram message object
+        command: Parsed command with the optional year argument
+    """
+    prefs = user_prefs.get(message.from_user.id)
+    if prefs is None or not prefs.has_location:
+        await message.answer(
+            "🗓 <b>Экспорт в календарь</b>\n\n"
+            "Сначала выберите город или поделитесь местоположением, "
+            "затем снова отправьте /export",
+            reply_markup=get_cities_keyboard(),
+            parse_mode="HTML"
+        )
+        return
+
+    current_year = timezones.local_today(prefs.latitude, prefs.longitude).year
+    year = current_year
+    if command.args:
+        if not command.args.strip().isdigit() or int(command.args) not in (current_year, current_year + 1):
+            await message.answer(
+                f"❌ Можно экспортировать {current_year} или {current_year + 1} год, "
+                f"например: /export {current_year + 1}"
+            )
+            return
+        year = int(command.args)
+
+    logger.info(f"User {message.from_user.id} exports {year} ({prefs.city or 'location'})")
+
+    async def show_placeholder():
+        await message.bot.send_chat_action(message.chat.id, ChatAction.UPLOAD_DOCUMENT)
+
+    try:
+        data = await fetch_with_placeholder(
+            ics_exporter.export_year(
+                prefs.latitude,
+                prefs.longitude,
+                year,
+                city=prefs.city,
+                method=prefs.method,
+                school=prefs.school
+            ),
+            show_placeholder
+        )
+
+    except AlAdhanAPIError as e:
+        logger.error(f"API error for user {message.from_user.id}: {e}")
+        await message.answer(formatter.format_error_message("api"))
+        return
+
+    place = f" — {prefs.city}" if prefs.city else ""
+    await message.answer_document(
+        BufferedInputFile(data, filename=ics_exporter.filename(year, prefs.city)),
+        caption=(
+            f"🗓 Время намаза на {year} год{place}\n"
+            f"Откройте файл, чтобы добавить события в календарь телефона."
+        )
+    )
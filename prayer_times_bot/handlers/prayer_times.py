@@ -5,16 +5,26 @@ Handles location processing and prayer times display
 from aiogram import Router, F
 from aiogram.filters import Command
 from aiogram.types import Message, CallbackQuery
-from datetime import datetime
+from typing import Optional, Tuple
 import logging
-import pytz
 
-from config import POLISH_CITIES, POLAND_TIMEZONE
+from config import POLISH_CITIES
 from services.aladhan_api import api, AlAdhanAPIError
+from services.cache import cell_center, location_cell
+from services.request_tracker import tracker, RequestSuperseded
+from services.replies import fetch_with_placeholder, edit_if_changed
 from services.formatter import formatter
+from services.month_view import month_view
+from services.timezones import timezones
+from services.next_prayer import NextPrayer, get_next_prayer
+from services.timings import DayTimings
+from services.user_prefs import user_prefs, UserPreferences
+from services.live_location import live_locations
 from keyboards.main_keyboards import (
     get_main_menu_keyboard,
     get_cities_keyboard,
+    get_time_options_keyboard,
+    get_month_pager_keyboard,
 )
 
 logger = logging.getLogger(__name__)
@@ -36,35 +46,183 @@ async def handle_location(message: Message):
 
     logger.info(f"User {message.from_user.id} shared location: {latitude}, {longitude}")
 
-    # Send "processing" message
-    processing_msg = await message.answer("⏳ Получаю время намаза...")
+    await user_prefs.set_location(message.from_user.id, latitude, longitude)
+
+    # Ignore repeated taps on the location button
+    request_key = ("location", location_cell(latitude, longitude))
+    if tracker.is_duplicate(message.chat.id, request_key):
+        logger.info(f"Ignoring duplicate location from user {message.from_user.id}")
+        return
 
     try:
-        # Get prayer times from API
-        timings = await api.get_timings_by_coordinates(latitude, longitude)
+        reply = await tracker.run(
+            message.chat.id,
+            _send_location_times(message, latitude, longitude)
+        )
+    except RequestSuperseded:
+        logger.info(f"Location request superseded for user {message.from_user.id}")
+        return
 
-        # Format and send response
-        response = formatter.format_daily_times(timings)
+    # Follow live location updates, recomputing only on cell or date change
+    if reply is not None and message.location.live_period:
+        live_locations.start(
+            message,
+            location_cell(latitude, longitude),
+            timezones.local_today(latitude, longitude),
+            reply
+        )
 
-        await processing_msg.edit_text(
-            response,
-            parse_mode="HTML"
+
+@router.edited_message(F.location)
+async def handle_live_location(message: Message):
+    """
+    Handle live location updates (edited location messages)
+
+    Updates inside the same location cell on the same local date are
+    ignored; otherwise the times message is refreshed in place.
+
+    Args:
+        message: Edited Telegram message with the new location
+    """
+    latitude = message.location.latitude
+    longitude = message.location.longitude
+    cell = location_cell(latitude, longitude)
+    today = timezones.local_today(latitude, longitude)
+
+    session = live_locations.needs_update(message, cell, today)
+    if session is None:
+        return
+
+    logger.info(f"User {message.from_user.id} moved to {latitude}, {longitude}")
+    prefs = await user_prefs.set_location(message.from_user.id, latitude, longitude)
+
+    async def refresh():
+        timings = await api.get_timings_by_coordinates(
+            latitude,
+            longitude,
+            method=prefs.method,
+            school=prefs.school
+        )
+        response = await _format_location_times(
+            latitude,
+            longitude,
+            timings,
+            prefs.method,
+            prefs.school
         )
+        await edit_if_changed(session.reply, response)
+        session.mark_shown(cell, today)
 
-        # Send menu keyboard
-        await message.answer(
-            "Что ещё вы хотите узнать?",
-            reply_markup=get_main_menu_keyboard()
+    try:
+        await tracker.run(message.chat.id, refresh())
+    except RequestSuperseded:
+        logger.info(f"Live location update superseded for user {message.from_user.id}")
+    except AlAdhanAPIError as e:
+        # Keep showing the previous times; the next update will retry
+        logger.error(f"API error for user {message.from_user.id}: {e}")
+
+
+async def _format_location_times(
+    latitude: float,
+    longitude: float,
+    timings: DayTimings,
+    method: int,
+    school: int
+) -> str:
+    """
+    Format daily times for shared coordinates with local timezone and countdown
+
+    Args:
+        latitude: Location latitude
+        longitude: Location longitude
+        timings: Today's timings at the location
+        method: Calculation method the timings were computed with
+        school: Asr school the timings were computed with
+
+    Returns:
+        Formatted message string with HTML markup
+    """
+    return formatter.format_daily_times(
+        timings,
+        timezone=timezones.timezone_name(latitude, longitude),
+        next_prayer=await _find_next_prayer(latitude, longitude, timings, method, school),
+        method=method,
+        school=school
+    )
+
+
+async def _send_location_times(
+    message: Message,
+    latitude: float,
+    longitude: float
+) -> Optional[Message]:
+    """
+    Fetch and send prayer times for shared coordinates
+
+    Cached times are sent as a single message; the "processing" placeholder
+    is only shown when the fetch is slow. The reply keyboard the location was
+    shared from is already on screen, so no separate menu message is sent.
+
+    Args:
+        message: Telegram message with location
+        latitude: Location latitude
+        longitude: Location longitude
+
+    Returns:
+        Message showing the times, or None if an error was reported
+    """
+    processing_msg = None
+    method, school = user_prefs.get_settings(message.from_user.id)
+
+    async def show_placeholder():
+        nonlocal processing_msg
+        processing_msg = await message.answer("⏳ Получаю время намаза...")
+
+    try:
+        # Get prayer times from cache or API
+        timings = await fetch_with_placeholder(
+            api.get_timings_by_coordinates(latitude, longitude, method=method, school=school),
+            show_placeholder
+        )
+
+        # Format and send response
+        response = await _format_location_times(latitude, longitude, timings, method, school)
+
+        if processing_msg is None:
+            return await message.answer(
+                response,
+                reply_markup=get_main_menu_keyboard(),
+                parse_mode="HTML"
+            )
+        return await processing_msg.edit_text(
+            response,
+            parse_mode="HTML"
         )
 
     except AlAdhanAPIError as e:
         logger.error(f"API error for user {message.from_user.id}: {e}")
-        error_msg = formatter.format_error_message("api")
-        await processing_msg.edit_text(error_msg)
+        await _send_location_error(message, processing_msg, "api")
+        return None
 
     except Exception as e:
         logger.error(f"Unexpected error for user {message.from_user.id}: {e}")
-        error_msg = formatter.format_error_message("general")
+        await _send_location_error(message, processing_msg, "general")
+        return None
+
+
+async def _send_location_error(message: Message, processing_msg: Optional[Message], error_type: str):
+    """
+    Report an error in place of the placeholder, or as a new message
+
+    Args:
+        message: Telegram message with location
+        processing_msg: Placeholder message, if one was shown
+        error_type: Error type for formatter.format_error_message
+    """
+    error_msg = formatter.format_error_message(error_type)
+    if processing_msg is None:
+        await message.answer(error_msg)
+    else:
         await processing_msg.edit_text(error_msg)
 
 
@@ -84,43 +242,141 @@ async def handle_city_selection(callback: CallbackQuery):
         await callback.answer("❌ Город не найден", show_alert=True)
         return
 
-    # Get coordinates
+    # Stop the button spinner right away, the result arrives as an edit
+    await callback.answer()
+
     latitude, longitude = POLISH_CITIES[city_name]
+    await user_prefs.set_location(callback.from_user.id, latitude, longitude, city=city_name)
 
-    # Update message to show processing
-    await callback.message.edit_text("⏳ Получаю время намаза...")
+    # Ignore double taps on the same button
+    chat_id = callback.message.chat.id
+    if tracker.is_duplicate(chat_id, callback.data):
+        logger.info(f"Ignoring duplicate city tap from user {callback.from_user.id}")
+        return
 
     try:
-        # Get prayer times from API
-        timings = await api.get_timings_by_coordinates(latitude, longitude)
+        await tracker.run(chat_id, _send_city_times(callback, city_name))
+    except RequestSuperseded:
+        logger.info(f"City request superseded for user {callback.from_user.id}")
 
-        # Format and send response
-        response = formatter.format_daily_times(timings, city=city_name)
 
-        await callback.message.edit_text(
-            response,
-            parse_mode="HTML"
+async def _send_city_times(callback: CallbackQuery, city_name: str):
+    """
+    Fetch and show prayer times for a selected city
+
+    The result replaces the city list in a single edit with the time options
+    attached; the placeholder edit is only made when the fetch is slow.
+
+    Args:
+        callback: Telegram callback query
+        city_name: Name of the selected city
+    """
+    # Get coordinates
+    latitude, longitude = POLISH_CITIES[city_name]
+    method, school = user_prefs.get_settings(callback.from_user.id)
+
+    async def show_placeholder():
+        await callback.message.edit_text("⏳ Получаю время намаза...")
+
+    try:
+        # Get prayer times from cache or API
+        timings = await fetch_with_placeholder(
+            api.get_timings_by_coordinates(latitude, longitude, method=method, school=school),
+            show_placeholder
         )
 
-        # Send menu keyboard in new message
-        await callback.message.answer(
-            "Что ещё вы хотите узнать?",
-            reply_markup=get_main_menu_keyboard()
+        # Format and send response
+        response = formatter.format_daily_times(
+            timings,
+            city=city_name,
+            next_prayer=await _find_next_prayer(latitude, longitude, timings, method, school),
+            method=method,
+            school=school
         )
 
-        await callback.answer()
+        await edit_if_changed(
+            callback.message,
+            response,
+            reply_markup=get_time_options_keyboard()
+        )
 
     except AlAdhanAPIError as e:
         logger.error(f"API error for user {callback.from_user.id}: {e}")
         error_msg = formatter.format_error_message("api")
         await callback.message.edit_text(error_msg)
-        await callback.answer()
 
     except Exception as e:
         logger.error(f"Unexpected error for user {callback.from_user.id}: {e}")
         error_msg = formatter.format_error_message("general")
         await callback.message.edit_text(error_msg)
-        await callback.answer()
+
+
+async def _find_next_prayer(
+    latitude: float,
+    longitude: float,
+    today: DayTimings,
+    method: int,
+    school: int
+) -> Optional[NextPrayer]:
+    """
+    Get next prayer for the daily message, omitting the line on API errors
+
+    Args:
+        latitude: Location latitude
+        longitude: Location longitude
+        today: Today's timings already loaded for the message
+        method: Calculation method
+        school: Asr school
+
+    Returns:
+        NextPrayer or None
+    """
+    try:
+        return await get_next_prayer(
+            latitude,
+            longitude,
+            today=today,
+            method=method,
+            school=school
+        )
+    except AlAdhanAPIError as e:
+        logger.warning(f"Next prayer unavailable for {latitude}, {longitude}: {e}")
+        return None
+
+
+@router.message(Command("next"))
+async def cmd_next(message: Message):
+    """
+    Handle /next command - show the next prayer and time remaining
+    for the user's last city or location
+
+    Args:
+        message: Telegram message object
+    """
+    prefs = user_prefs.get(message.from_user.id)
+    if prefs is None or not prefs.has_location:
+        await message.answer(
+            "⏭ <b>Следующий намаз</b>\n\nВыберите город или поделитесь местоположением:",
+            reply_markup=get_cities_keyboard(),
+            parse_mode="HTML"
+        )
+        return
+
+    try:
+        next_prayer = await get_next_prayer(
+            prefs.latitude,
+            prefs.longitude,
+            method=prefs.method,
+            school=prefs.school
+        )
+        await message.answer(
+            formatter.format_next_prayer(next_prayer, city=prefs.city),
+            parse_mode="HTML"
+        )
+
+    except AlAdhanAPIError as e:
+        logger.error(f"API error for user {message.from_user.id}: {e}")
+        await message.answer(formatter.format_error_message("api"))
 
 
 @router.message(Command("today"))
@@ -213,12 +469,159 @@ async def show_week_times(callback: CallbackQuery):
 @router.callback_query(F.data == "time:month")
 async def show_month_times(callback: CallbackQuery):
     """
-    Handle monthly times callback (future feature)
+    Handle monthly times callback - open the page with today's date
 
     Args:
         callback: Telegram callback query
     """
-    await callback.answer(
-        "📖 Функция 'На месяц' будет добавлена в следующей версии",
-        show_alert=True
-    )
+    prefs = user_prefs.get(callback.from_user.id)
+    if prefs is None or not prefs.has_location:
+        await callback.answer(
+            "📍 Сначала выберите город или поделитесь местоположением",
+            show_alert=True
+        )
+        return
+
+    await _show_month_page(callback, prefs)
+
+
+@router.callback_query(F.data.startswith("month:"))
+async def handle_month_page(callback: CallbackQuery):
+    """
+    Handle month view navigation - edits the message in place
+
+    The page is rendered for the location and settings stored in the
+    button, not the user's current ones, so it matches the message header.
+
+    Args:
+        callback: Telegram callback query
+    """
+    view = _parse_month_view(callback.data)
+    if view is None:
+        # Buttons from before the location was part of the data, or a city no longer listed
+        await callback.answer("Откройте расписание на месяц заново", show_alert=True)
+        return
+
+    prefs, year, month, page = view
+    await _show_month_page(callback, prefs, year, month, page)
+
+
+def _month_location(prefs: UserPreferences) -> str:
+    """Location part of month pager callback data: city name or location cell"""
+    if prefs.city is not None:
+        return prefs.city
+    row, column = location_cell(prefs.latitude, prefs.longitude)
+    return f"{row},{column}"
+
+
+def _parse_month_view(data: str) -> Optional[Tuple[UserPreferences, int, int, int]]:
+    """
+    Parse month pager callback data
+
+    Args:
+        data: Callback data "month:<year>:<month>:<page>:<location>:<method>:<school>"
+
+    Returns:
+        Tuple (location and settings, year, month, page), or None if the data is not usable
+    """
+    parts = data.split(":")
+    if len(parts) != 7:
+        return None
+
+    _, year, month, page, location, method, school = parts
+    try:
+        numbers = tuple(map(int, (year, month, page, method, school)))
+        if location in POLISH_CITIES:
+            latitude, longitude = POLISH_CITIES[location]
+            city = location
+        else:
+            row, column = map(int, location.split(","))
+            latitude, longitude = cell_center((row, column))
+            city = None
+    except ValueError:
+        return None
+
+    year, month, page, method, school = numbers
+    return UserPreferences(latitude, longitude, city, method, school), year, month, page
+
+
+@router.callback_query(F.data == "noop")
+async def handle_noop(callback: CallbackQuery):
+    """
+    Handle presses on informational buttons (e.g. page counter)
+
+    Args:
+        callback: Telegram callback query
+    """
+    await callback.answer()
+
+
+async def _show_month_page(
+    callback: CallbackQuery,
+    prefs: UserPreferences,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    page: Optional[int] = None
+):
+    """
+    Show a page of the month view
+
+    Pages are pre-rendered per location and month, so navigation
+    never triggers an upstream call once the month is loaded.
+
+    Args:
+        callback: Telegram callback query
+        prefs: Location and calculation settings of the month view
+        year: Gregorian year (default: current local year)
+        month: Gregorian month number (default: current local month)
+        page: Page index, 0-based (default: page with today's date)
+    """
+    if year is None or month is None or page is None:
+        today = timezones.local_today(prefs.latitude, prefs.longitude)
+        year, month = today.year, today.month
+        page = month_view.page_of_day(today.day)
+
+    await callback.answer()
+
+    async def show_placeholder():
+        await callback.message.edit_text("⏳ Получаю расписание на месяц...")
+
+    try:
+        pages = await fetch_with_placeholder(
+            month_view.get_pages(
+                prefs.latitude,
+                prefs.longitude,
+                year,
+                month,
+                city=prefs.city,
+                method=prefs.method,
+                school=prefs.school
+            ),
+            show_placeholder
+        )
+
+        page = min(max(page, 0), len(pages) - 1)
+
+        await edit_if_changed(
+            callback.message,
+            pages[page],
+            reply_markup=get_month_pager_keyboard(
+                year,
+                month,
+                page,
+                len(pages),
+                _month_location(prefs),
+                prefs.method,
+                prefs.school
+            )
+        )
+
+    except AlAdhanAPIError as e:
+        logger.error(f"API error for user {callback.from_user.id}: {e}")
+        error_msg = formatter.format_error_message("api")
+        await callback.message.edit_text(error_msg)
+
+    except Exception as e:
+        logger.error(f"Unexpected error for user {callback.from_user.id}: {e}")
+        error_msg = formatter.format_error_message("general")
+        await callback.message.edit_text(error_msg)
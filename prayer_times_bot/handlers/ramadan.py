@@ -0,0 +1,63 @@
+"""
+Ramadan Handler
+Handles /ramadan - compact suhoor and iftar times
+"""
+from aiogram import Router
+from aiogram.filters import Command
+from aiogram.types import Message
+import logging
+
+from services.aladhan_api import AlAdhanAPIError
+from services.formatter import formatter
+from services.ramadan import ramadan
+from services.timezones import timezones
+from services.user_prefs import user_prefs
+from keyboards.main_keyboards import get_cities_keyboard
+
+logger = logging.getLogger(__name__)
+
+# Create router for Ramadan handlers
+router = Router()
+
+
+@router.message(Command("ramadan"))
+async def cmd_ramadan(message: Message):
+    """
+    Handle /ramadan command - show today's suhoor and iftar
+    for the user's last city or location
+
+    Args:
+        message: Telegram message object
+    """
+    prefs = user_prefs.get(message.from_user.id)
+    if prefs is None or not prefs.has_location:
+        await message.answer(
+            "🌙 <b>Рамадан</b>\n\nВыберите город или поделитесь местоположением:",
+            reply_markup=get_cities_keyboard(),
+            parse_mode="HTML"
+        )
+        return
+
+    today = timezones.local_today(prefs.latitude, prefs.longitude)
+    if not ramadan.is_active(today):
+        if ramadan.enabled and today < ramadan.first_day:
+            text = f"🌙 Рамадан начнётся {ramadan.first_day.strftime('%d.%m.%Y')}."
+        else:
+            text = "🌙 Сейчас не Рамадан. Время намаза: /today"
+        await message.answer(text)
+        return
+
+    try:
+        text = await ramadan.get_message(
+            prefs.latitude,
+            prefs.longitude,
+            today,
+            city=prefs.city,
+            method=prefs.method,
+            school=prefs.school
+        )
+        await message.answer(text, parse_mode="HTML")
+
+    except AlAdhanAPIError as e:
+        logger.error(f"API error for user {message.from_user.id}: {e}")
+        await message.answer(formatter.format_error_message("api"))
@@ -0,0 +1,84 @@
+"""
+Settings Handler
+Handles calculation method and Asr school selection
+"""
+from aiogram import Router, F
+from aiogram.filters import Command
+from aiogram.types import Message, CallbackQuery
+import logging
+
+from config import CALCULATION_METHODS, ASR_SCHOOLS
+from services.replies import edit_if_changed
+from services.subscriptions import subscriptions
+from services.user_prefs import user_prefs
+from keyboards.main_keyboards import get_method_settings_keyboard
+
+logger = logging.getLogger(__name__)
+
+# Create router for settings handlers
+router = Router()
+
+
+def _format_settings(method: int, school: int) -> str:
+    """Settings message showing the current method and Asr school"""
+    name, params = CALCULATION_METHODS[method]
+    return f"""⚙️ <b>Метод расчёта</b>
+
+📖 <b>{name}</b>
+<i>({params})</i>
+🌤 Аср: <b>{ASR_SCHOOLS[school]}</b>
+
+Выбор сохраняется и применяется ко всем расписаниям."""
+
+
+@router.message(Command("method"))
+async def cmd_method(message: Message):
+    """
+    Handle /method command - show calculation settings
+
+    Args:
+        message: Telegram message object
+    """
+    method, school = user_prefs.get_settings(message.from_user.id)
+
+    await message.answer(
+        _format_settings(method, school),
+        reply_markup=get_method_settings_keyboard(method, school),
+        parse_mode="HTML"
+    )
+
+
+@router.callback_query(F.data.startswith("method:") | F.data.startswith("school:"))
+async def handle_settings_choice(callback: CallbackQuery):
+    """
+    Handle method or Asr school selection - edits the settings message in place
+
+    Args:
+        callback: Telegram callback query
+    """
+    kind, value = callback.data.split(":", 1)
+    choice = int(value)
+
+    if kind == "method":
+        if choice not in CALCULATION_METHODS:
+            await callback.answer("❌ Метод не найден", show_alert=True)
+            return
+        prefs = await user_prefs.set_method(callback.from_user.id, choice)
+    else:
+        if choice not in ASR_SCHOOLS:
+            await callback.answer("❌ Мазхаб не найден", show_alert=True)
+            return
+        prefs = await user_prefs.set_school(callback.from_user.id, choice)
+
+    logger.info(
+        f"User {callback.from_user.id} selected method {prefs.method}, school {prefs.school}"
+    )
+    # The daily digest of this chat follows the new settings
+    await subscriptions.update_settings(callback.message.chat.id, prefs.method, prefs.school)
+
+    await callback.answer("✅ Сохранено")
+    await edit_if_changed(
+        callback.message,
+        _format_settings(prefs.method, prefs.school),
+        reply_markup=get_method_settings_keyboard(prefs.method, prefs.school)
+    )
@@ -54,7 +54,13 @@ async def cmd_help(message: Message):
 /start - Начать работу с ботом
 /today - Время намаза на сегодня
 /week - Расписание на неделю
+/next - Следующий намаз и сколько осталось
 /cities - Выбрать город из списка
+/method - Метод расчёта и мазхаб для Асра
+/ramadan - Сухур и ифтар в Рамадан
+/export - Расписание на год в календарь телефона (.ics)
+/subscribe - Получать расписание каждое утро
+/unsubscribe - Отписаться от расписания
 /help - Показать эту справку
 
 <b>Как использовать бот:</b>
@@ -69,9 +75,10 @@ async def cmd_help(message: Message):
    Используйте кнопки "📅 На сегодня" и "📆 На неделю" для просмотра расписания.
 
 <b>О расчётах:</b>
-Бот использует метод <b>Всемирной Мусульманской Лиги</b>:
+По умолчанию бот использует метод <b>Всемирной Мусульманской Лиги</b>:
 • Угол Фаджр: 18°
 • Угол Иша: 17°
+Другой метод можно выбрать командой /method
 
 Расчёты соответствуют islamicfinder.org
 
@@ -0,0 +1,73 @@
+"""
+Subscription Handler
+Handles /subscribe and /unsubscribe for the daily digest
+"""
+from aiogram import Router
+from aiogram.filters import Command
+from aiogram.types import Message
+import logging
+
+from config import DIGEST_TIME
+from services.subscriptions import subscriptions
+from services.user_prefs import user_prefs
+from keyboards.main_keyboards import get_cities_keyboard
+
+logger = logging.getLogger(__name__)
+
+# Create router for subscription handlers
+router = Router()
+
+
+@router.message(Command("subscribe"))
+async def cmd_subscribe(message: Message):
+    """
+    Handle /subscribe command - subscribe chat to the daily digest
+    for the user's last selected city or location
+
+    Args:
+        message: Telegram message object
+    """
+    prefs = user_prefs.get(message.from_user.id)
+    if prefs is None or not prefs.has_location:
+        await message.answer(
+            "🔔 <b>Ежедневное расписание</b>\n\n"
+            "Сначала выберите город или поделитесь местоположением, "
+            "затем снова отправьте /subscribe",
+            reply_markup=get_cities_keyboard(),
+            parse_mode="HTML"
+        )
+        return
+
+    await subscriptions.subscribe(
+        message.chat.id,
+        prefs.latitude,
+        prefs.longitude,
+        city=prefs.city,
+        method=prefs.method,
+        school=prefs.school
+    )
+
+    logger.info(f"Chat {message.chat.id} subscribed to digest ({prefs.city or 'location'})")
+
+    place = f" для <b>{prefs.city}</b>" if prefs.city else " для вашего местоположения"
+    await message.answer(
+        f"🔔 Вы подписались на ежедневное расписание{place}.\n\n"
+        f"Сообщение будет приходить каждый день в {DIGEST_TIME.strftime('%H:%M')}.\n"
+        f"Отписаться: /unsubscribe",
+        parse_mode="HTML"
+    )
+
+
+@router.message(Command("unsubscribe"))
+async def cmd_unsubscribe(message: Message):
+    """
+    Handle /unsubscribe command
+
+    Args:
+        message: Telegram message object
+    """
+    if await subscriptions.unsubscribe(message.chat.id):
+        logger.info(f"Chat {message.chat.id} unsubscribed from digest")
+        await message.answer("🔕 Вы отписались от ежедневного расписания.")
+    else:
+        await message.answer("ℹ️ Вы не подписаны. Подписаться: /subscribe")
@@ -10,7 +10,7 @@ from aiogram.types import (
 )
 from typing import List
 
-from config import POLISH_CITIES
+from config import POLISH_CITIES, CALCULATION_METHODS, ASR_SCHOOLS
 
 
 def get_main_menu_keyboard() -> ReplyKeyboardMarkup:
@@ -160,3 +160,104 @@ def get_time_options_keyboard() -> InlineKeyboardMarkup:
     ]
 
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+
+def get_month_pager_keyboard(
+    year: int,
+    month: int,
+    page: int,
+    pages: int,
+    location: str,
+    method: int,
+    school: int
+) -> InlineKeyboardMarkup:
+    """
+    Navigation keyboard for the paginated month view
+
+    The buttons carry the location and settings of the shown month, so an
+    old message keeps paging the same schedule after the user moves on.
+
+    Args:
+        year: Gregorian year
+        month: Gregorian month number
+        page: Current page index (0-based)
+        pages: Total number of pages
+        location: City name or "row,column" location cell
+        method: Calculation method of the shown month
+        school: Asr school of the shown month
+
+    Returns:
+        InlineKeyboardMarkup with previous/next page buttons
+    """
+    navigation = []
+    if page > 0:
+        navigation.append(
+            InlineKeyboardButton(
+                text="◀️",
+                callback_data=f"month:{year}:{month}:{page - 1}:{location}:{method}:{school}"
+            )
+        )
+    navigation.append(
+        InlineKeyboardButton(
+            text=f"{page + 1}/{pages}",
+            callback_data="noop"
+        )
+    )
+    if page < pages - 1:
+        navigation.append(
+            InlineKeyboardButton(
+                text="▶️",
+                callback_data=f"month:{year}:{month}:{page + 1}:{location}:{method}:{school}"
+            )
+        )
+
+    keyboard = [
+        navigation,
+        [
+            InlineKeyboardButton(
+                text="◀️ Назад",
+                callback_data="back_to_menu"
+            )
+        ]
+    ]
+
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+
+def get_method_settings_keyboard(method: int, school: int) -> InlineKeyboardMarkup:
+    """
+    Keyboard for choosing calculation method and Asr school
+
+    Args:
+        method: Currently selected calculation method
+        school: Currently selected Asr school
+
+    Returns:
+        InlineKeyboardMarkup with the current choices marked
+    """
+    keyboard = [
+        [
+            InlineKeyboardButton(
+                text=f"{'✅ ' if method_id == method else ''}{name}",
+                callback_data=f"method:{method_id}"
+            )
+        ]
+        for method_id, (name, _) in CALCULATION_METHODS.items()
+    ]
+
+    keyboard.append([
+        InlineKeyboardButton(
+            text=f"{'✅ ' if school_id == school else ''}Аср: {name.split(' ', 1)[0]}",
+            callback_data=f"school:{school_id}"
+        )
+        for school_id, name in ASR_SCHOOLS.items()
+    ])
+
+    keyboard.append([
+        InlineKeyboardButton(
+            text="◀️ Назад",
+            callback_data="back_to_menu"
+        )
+    ])
+
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
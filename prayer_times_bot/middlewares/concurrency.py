@@ -0,0 +1,80 @@
+"""
+Concurrency Limit Middleware
+Bounds simultaneous handlers per update type and sheds load when saturated
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, InlineQuery, Message, TelegramObject
+
+from services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+BUSY_TEXT = "⏳ Бот сейчас перегружен. Пожалуйста, попробуйте через минуту."
+
+
+class ConcurrencyLimitMiddleware(BaseMiddleware):
+    """
+    Outer middleware allowing at most `limit` handlers to run at once
+
+    Up to `queue_size` further updates wait for a free slot; beyond that
+    the update is answered with a short "busy" reply and dropped.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, notify: bool = True):
+        """
+        Initialize middleware
+
+        Args:
+            name: Update type name used in metrics (e.g. "message")
+            limit: Maximum concurrently running handlers
+            queue_size: Maximum updates waiting for a slot
+            notify: Send a "busy" reply for shed updates (False drops them silently)
+        """
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.notify = notify
+        self._semaphore = asyncio.Semaphore(limit)
+        self._waiting = 0
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        if self._semaphore.locked() and self._waiting >= self.queue_size:
+            metrics.increment(f"updates.{self.name}.shed")
+            if self.notify:
+                await self._reject(event)
+            return None
+
+        self._waiting += 1
+        queued_at = time.monotonic()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        metrics.observe(f"updates.{self.name}.queue_wait", time.monotonic() - queued_at)
+
+        try:
+            return await handler(event, data)
+        finally:
+            self._semaphore.release()
+
+    async def _reject(self, event: TelegramObject) -> None:
+        """Answer a shed update with a quick "busy" reply"""
+        try:
+            if isinstance(event, CallbackQuery):
+                await event.answer(BUSY_TEXT)
+            elif isinstance(event, InlineQuery):
+                await event.answer([], cache_time=1, is_personal=True)
+            elif isinstance(event, Message) and event.chat.type == "private":
+                await event.answer(BUSY_TEXT)
+        except Exception as e:
+            logger.warning(f"Failed to send busy reply for {self.name}: {e}")
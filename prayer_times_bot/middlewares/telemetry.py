@@ -0,0 +1,76 @@
+"""
+Telegram API Telemetry Middleware
+Records calls, latency and error codes per Bot API method
+"""
+import time
+from typing import Dict, Type
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import (
+    TelegramAPIError,
+    TelegramBadRequest,
+    TelegramConflictError,
+    TelegramForbiddenError,
+    TelegramNetworkError,
+    TelegramNotFound,
+    TelegramRetryAfter,
+    TelegramServerError,
+    TelegramUnauthorizedError,
+)
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from services.metrics import metrics
+
+# Bot API error codes behind aiogram exceptions (checked in order, subclasses first)
+_ERROR_CODES: Dict[Type[TelegramAPIError], str] = {
+    TelegramRetryAfter: "429",
+    TelegramBadRequest: "400",
+    TelegramUnauthorizedError: "401",
+    TelegramForbiddenError: "403",
+    TelegramNotFound: "404",
+    TelegramConflictError: "409",
+    TelegramServerError: "5xx",
+    TelegramNetworkError: "network",
+}
+
+# Long polling holds the request open on purpose, its latency says nothing
+_IGNORED_METHODS = frozenset({"getUpdates"})
+
+
+def _error_code(error: TelegramAPIError) -> str:
+    """Map an aiogram exception to its Bot API error code"""
+    for error_type, code in _ERROR_CODES.items():
+        if isinstance(error, error_type):
+            return code
+    return "other"
+
+
+class TelegramTelemetryMiddleware(BaseRequestMiddleware):
+    """
+    Session middleware timing every Bot API call
+
+    Metrics per method (e.g. sendMessage): `telegram.<method>.calls`,
+    latency `telegram.<method>` and `telegram.<method>.error.<code>`.
+    """
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType]
+    ) -> Response[TelegramType]:
+        name = method.__api_method__
+        if name in _IGNORED_METHODS:
+            return await make_request(bot, method)
+
+        metrics.increment(f"telegram.{name}.calls")
+        started = time.monotonic()
+        try:
+            return await make_request(bot, method)
+        except TelegramAPIError as e:
+            metrics.increment(f"telegram.{name}.error.{_error_code(e)}")
+            raise
+        finally:
+            metrics.observe(f"telegram.{name}", time.monotonic() - started)
@@ -2,12 +2,26 @@
 AlAdhan API Service for fetching Islamic prayer times
 API Documentation: https://aladhan.com/prayer-times-api
 """
+import asyncio
 import aiohttp
-from datetime import datetime
-from typing import Dict, Optional, Tuple
+from collections import Counter
+from datetime import date as date_type, datetime
+from typing import Any, Awaitable, Callable, Collection, Dict, Hashable, List, Optional, Tuple
 import logging
-
-from config import ALADHAN_API_URL, CALCULATION_METHOD
+import pytz
+
+from config import (
+    ALADHAN_API_URL,
+    CALCULATION_METHOD,
+    ASR_SCHOOL,
+    CACHE_MAX_ENTRIES,
+    DISK_CACHE_PATH,
+    POLAND_TIMEZONE,
+)
+from services.cache import LRUCache, location_cell
+from services.disk_cache import DiskCache
+from services.timings import DayTimings, MonthTimings
+from services.timezones import timezones
 
 logger = logging.getLogger(__name__)
 
@@ -20,48 +34,128 @@ class AlAdhanAPIError(Exception):
 class AlAdhanAPI:
     """Service for interacting with AlAdhan Prayer Times API"""
 
-    def __init__(self, api_url: str = ALADHAN_API_URL, method: int = CALCULATION_METHOD):
+    def __init__(
+        self,
+        api_url: str = ALADHAN_API_URL,
+        method: int = CALCULATION_METHOD,
+        school: int = ASR_SCHOOL,
+        disk_cache: Optional[DiskCache] = None
+    ):
         """
         Initialize AlAdhan API client
 
         Args:
             api_url: Base URL for AlAdhan API
-            method: Calculation method (3 = Muslim World League)
+            method: Default calculation method (3 = Muslim World League)
+            school: Default Asr school (0 = Standard, 1 = Hanafi)
+            disk_cache: Durable cache consulted on in-memory misses (optional)
         """
         self.api_url = api_url
         self.method = method
+        self.school = school
         self.timeout = aiohttp.ClientTimeout(total=10)
-
-    async def get_timings_by_coordinates(
+        self.disk_cache = disk_cache
+
+        # Typed timings keyed by (location cell | city, date, method, school)
+        self.day_cache = LRUCache(CACHE_MAX_ENTRIES)
+        # Typed monthly calendars keyed by (location cell, year, month, method, school)
+        self.month_cache = LRUCache(CACHE_MAX_ENTRIES)
+        # Upstream requests in flight, shared by concurrent callers of the same key
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        # Lookups per location cell and per (method, school), used to pick warm-up targets
+        self._cell_hits: Counter = Counter()
+        self._settings_hits: Counter = Counter()
+
+    def hot_cells(
         self,
-        latitude: float,
-        longitude: float,
-        date: Optional[str] = None
-    ) -> Dict[str, str]:
+        count: int,
+        exclude: Collection[Tuple[int, int]] = ()
+    ) -> List[Tuple[int, int]]:
         """
-        Get prayer timings for specific coordinates
+        Get the most requested location cells
 
         Args:
-            latitude: Location latitude
-            longitude: Location longitude
-            date: Date in DD-MM-YYYY format (default: today)
+            count: Maximum number of cells to return
+            exclude: Cells to skip (e.g. cells of listed cities, covered anyway)
 
         Returns:
-            Dictionary with prayer times
+            List of location cells, most requested first
+        """
+        cells = []
+        for cell, _ in self._cell_hits.most_common():
+            if len(cells) >= count:
+                break
+            if cell not in exclude:
+                cells.append(cell)
+        return cells
+
+    def popular_settings(self, count: int) -> List[Tuple[int, int]]:
+        """
+        Get the most requested calculation settings, the defaults always first
 
-        Raises:
-            AlAdhanAPIError: If API request fails
+        Args:
+            count: Maximum number of (method, school) pairs to return
+
+        Returns:
+            List of (method, school) pairs
         """
-        if date is None:
-            date = datetime.now().strftime("%d-%m-%Y")
+        settings = [(self.method, self.school)]
+        for pair, _ in self._settings_hits.most_common(count):
+            if len(settings) >= count:
+                break
+            if pair not in settings:
+                settings.append(pair)
+        return settings[:count]
+
+    def _resolve_settings(self, method: Optional[int], school: Optional[int]) -> Tuple[int, int]:
+        """Apply default method and school"""
+        return (
+            self.method if method is None else method,
+            self.school if school is None else school,
+        )
+
+    async def _fetch_once(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Collapse concurrent requests for the same key into one upstream call
 
-        url = f"{self.api_url}/timings/{date}"
-        params = {
-            "latitude": latitude,
-            "longitude": longitude,
-            "method": self.method,
-        }
+        Callers that are cancelled (e.g. superseded chat requests) do not
+        cancel the shared request, so other waiters still get the result.
+
+        Args:
+            key: Cache key identifying the request
+            fetch: Factory producing the upstream request coroutine
+
+        Returns:
+            Result of the shared request
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(key, done))
+        return await asyncio.shield(task)
+
+    def _finish_inflight(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget finished shared request and consume its exception"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    async def _get_data(self, url: str, params: Dict[str, Any]) -> Any:
+        """
+        Perform GET request and return the "data" field of the response
+
+        Args:
+            url: Endpoint URL
+            params: Query parameters
 
+        Returns:
+            Response "data" payload
+
+        Raises:
+            AlAdhanAPIError: If API request fails
+        """
         try:
             async with aiohttp.ClientSession(timeout=self.timeout) as session:
                 async with session.get(url, params=params) as response:
@@ -75,8 +169,10 @@ class AlAdhanAPI:
                     if data.get("code") != 200:
                         raise AlAdhanAPIError(f"API error: {data.get('status', 'Unknown error')}")
 
-                    return data["data"]["timings"]
+                    return data["data"]
 
+        except AlAdhanAPIError:
+            raise
         except aiohttp.ClientError as e:
             logger.error(f"Network error calling AlAdhan API: {e}")
             raise AlAdhanAPIError(f"Ошибка сети: {str(e)}")
@@ -84,115 +180,204 @@ class AlAdhanAPI:
             logger.error(f"Unexpected error: {e}")
             raise AlAdhanAPIError(f"Неожиданная ошибка: {str(e)}")
 
+    async def get_timings_by_coordinates(
+        self,
+        latitude: float,
+        longitude: float,
+        date: Optional[date_type] = None,
+        method: Optional[int] = None,
+        school: Optional[int] = None
+    ) -> DayTimings:
+        """
+        Get prayer timings for specific coordinates
+
+        Args:
+            latitude: Location latitude
+            longitude: Location longitude
+            date: Date of the timings (default: today at the location)
+            method: Calculation method (default: client default)
+            school: Asr school (default: client default)
+
+        Returns:
+            DayTimings for the requested day
+
+        Raises:
+            AlAdhanAPIError: If API request fails
+        """
+        if date is None:
+            date = timezones.local_today(latitude, longitude)
+
+        method, school = self._resolve_settings(method, school)
+        cell = location_cell(latitude, longitude)
+        self._cell_hits[cell] += 1
+        self._settings_hits[(method, school)] += 1
+
+        cache_key = (cell, date, method, school)
+        cached = self.day_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Day entries of a loaded month may have been evicted while the month is still cached
+        month = self.month_cache.get((cell, date.year, date.month, method, school))
+        if month is not None:
+            timings = month.day(date.day)
+            self.day_cache.set(cache_key, timings)
+            return timings
+
+        url = f"{self.api_url}/timings/{date.strftime('%d-%m-%Y')}"
+        params = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "method": method,
+            "school": school,
+        }
+
+        async def fetch() -> DayTimings:
+            if self.disk_cache is not None:
+                stored = await self.disk_cache.get_day(cell, date, method, school)
+                if stored is not None:
+                    self.day_cache.set(cache_key, stored)
+                    return stored
+
+            data = await self._get_data(url, params)
+            timings = DayTimings.from_api_day(data)
+            self.day_cache.set(cache_key, timings)
+
+            if self.disk_cache is not None:
+                await self.disk_cache.put_days(cell, method, school, [timings])
+
+            return timings
+
+        return await self._fetch_once(cache_key, fetch)
+
     async def get_timings_by_city(
         self,
         city: str,
         country: str = "Poland",
-        date: Optional[str] = None
-    ) -> Dict[str, str]:
+        date: Optional[date_type] = None,
+        method: Optional[int] = None,
+        school: Optional[int] = None
+    ) -> DayTimings:
         """
         Get prayer timings for a specific city
 
         Args:
             city: City name
             country: Country name (default: Poland)
-            date: Date in DD-MM-YYYY format (default: today)
+            date: Date of the timings (default: today in POLAND_TIMEZONE)
+            method: Calculation method (default: client default)
+            school: Asr school (default: client default)
 
         Returns:
-            Dictionary with prayer times
+            DayTimings for the requested day
 
         Raises:
             AlAdhanAPIError: If API request fails
         """
         if date is None:
-            date = datetime.now().strftime("%d-%m-%Y")
+            date = datetime.now(pytz.timezone(POLAND_TIMEZONE)).date()
+
+        method, school = self._resolve_settings(method, school)
+
+        cache_key = ((city.lower(), country.lower()), date, method, school)
+        cached = self.day_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-        url = f"{self.api_url}/timingsByCity/{date}"
+        url = f"{self.api_url}/timingsByCity/{date.strftime('%d-%m-%Y')}"
         params = {
             "city": city,
             "country": country,
-            "method": self.method,
+            "method": method,
+            "school": school,
         }
 
-        try:
-            async with aiohttp.ClientSession(timeout=self.timeout) as session:
-                async with session.get(url, params=params) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"AlAdhan API error: {response.status} - {error_text}")
-                        raise AlAdhanAPIError(f"API returned status {response.status}")
-
-                    data = await response.json()
-
-                    if data.get("code") != 200:
-                        raise AlAdhanAPIError(f"API error: {data.get('status', 'Unknown error')}")
-
-                    return data["data"]["timings"]
+        async def fetch() -> DayTimings:
+            data = await self._get_data(url, params)
+            timings = DayTimings.from_api_day(data)
+            self.day_cache.set(cache_key, timings)
+            return timings
 
-        except aiohttp.ClientError as e:
-            logger.error(f"Network error calling AlAdhan API: {e}")
-            raise AlAdhanAPIError(f"Ошибка сети: {str(e)}")
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            raise AlAdhanAPIError(f"Неожиданная ошибка: {str(e)}")
+        return await self._fetch_once(cache_key, fetch)
 
     async def get_monthly_calendar(
         self,
         latitude: float,
         longitude: float,
         month: Optional[int] = None,
-        year: Optional[int] = None
-    ) -> list:
+        year: Optional[int] = None,
+        method: Optional[int] = None,
+        school: Optional[int] = None,
+        fill_cache: bool = True
+    ) -> MonthTimings:
         """
         Get prayer timings for entire month
 
         Args:
             latitude: Location latitude
             longitude: Location longitude
-            month: Month number (default: current month)
-            year: Year (default: current year)
+            month: Month number (default: current month at the location)
+            year: Year (default: current year at the location)
+            method: Calculation method (default: client default)
+            school: Asr school (default: client default)
+            fill_cache: Store the month in the in-memory caches; bulk readers
+                pass False so they only use and fill the disk cache
 
         Returns:
-            List of daily prayer times
+            MonthTimings for the requested month
 
         Raises:
             AlAdhanAPIError: If API request fails
         """
-        now = datetime.now()
+        now = timezones.local_now(latitude, longitude)
         if month is None:
             month = now.month
         if year is None:
             year = now.year
 
+        method, school = self._resolve_settings(method, school)
+        cell = location_cell(latitude, longitude)
+        cache_key = (cell, year, month, method, school)
+        if fill_cache:
+            cached = self.month_cache.get(cache_key)
+        else:
+            cached = self.month_cache.peek(cache_key)
+        if cached is not None:
+            return cached
+
         url = f"{self.api_url}/calendar/{year}/{month}"
         params = {
             "latitude": latitude,
             "longitude": longitude,
-            "method": self.method,
+            "method": method,
+            "school": school,
         }
 
-        try:
-            async with aiohttp.ClientSession(timeout=self.timeout) as session:
-                async with session.get(url, params=params) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"AlAdhan API error: {response.status} - {error_text}")
-                        raise AlAdhanAPIError(f"API returned status {response.status}")
+        async def fetch() -> MonthTimings:
+            calendar = None
+            if self.disk_cache is not None:
+                calendar = await self.disk_cache.get_month(cell, year, month, method, school)
 
-                    data = await response.json()
+            if calendar is None:
+                data = await self._get_data(url, params)
+                calendar = MonthTimings.from_api(year, month, data)
+                if self.disk_cache is not None:
+                    await self.disk_cache.put_days(cell, method, school, calendar)
 
-                    if data.get("code") != 200:
-                        raise AlAdhanAPIError(f"API error: {data.get('status', 'Unknown error')}")
+            if not fill_cache:
+                return calendar
 
-                    return data["data"]
+            self.month_cache.set(cache_key, calendar)
 
-        except aiohttp.ClientError as e:
-            logger.error(f"Network error calling AlAdhan API: {e}")
-            raise AlAdhanAPIError(f"Ошибка сети: {str(e)}")
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            raise AlAdhanAPIError(f"Неожиданная ошибка: {str(e)}")
+            # A loaded month also answers every daily lookup inside it
+            for day in calendar:
+                self.day_cache.set((cell, day.date, method, school), day)
+
+            return calendar
+
+        # Bulk reads share requests only with each other, so interactive callers still fill the caches
+        return await self._fetch_once(cache_key if fill_cache else ("bulk", *cache_key), fetch)
 
 
 # Global API instance
-api = AlAdhanAPI()
+api = AlAdhanAPI(disk_cache=DiskCache() if DISK_CACHE_PATH else None)
@@ -0,0 +1,262 @@
+"""
+Daily Digest Broadcast Service
+Renders the morning schedule once per subscriber group and streams sends
+"""
+import asyncio
+import logging
+from datetime import date as date_type, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pytz
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramAPIError,
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramNetworkError,
+    TelegramRetryAfter,
+    TelegramServerError,
+)
+
+from config import (
+    POLAND_TIMEZONE,
+    DIGEST_TIME,
+    DIGEST_BATCH_SIZE,
+    DIGEST_CONCURRENCY,
+    DIGEST_MESSAGES_PER_SECOND,
+    DIGEST_CATCH_UP_HOURS,
+)
+from services.aladhan_api import api, AlAdhanAPIError
+from services.formatter import formatter
+from services.subscriptions import subscriptions, SubscriptionStore
+from services.timezones import timezones
+
+logger = logging.getLogger(__name__)
+
+
+class DigestBroadcaster:
+    """Sends the daily schedule to all subscribers with checkpointed progress"""
+
+    def __init__(
+        self,
+        bot: Bot,
+        store: SubscriptionStore = subscriptions,
+        batch_size: int = DIGEST_BATCH_SIZE,
+        concurrency: int = DIGEST_CONCURRENCY,
+        messages_per_second: float = DIGEST_MESSAGES_PER_SECOND,
+        catch_up_hours: float = DIGEST_CATCH_UP_HOURS
+    ):
+        """
+        Initialize broadcaster
+
+        Args:
+            bot: Bot instance used for sending
+            store: Subscription store
+            batch_size: Sends between progress checkpoints
+            concurrency: Maximum simultaneous sendMessage calls
+            messages_per_second: Target send rate (Telegram allows ~30/s)
+            catch_up_hours: How long after DIGEST_TIME a missed digest is still sent on startup
+        """
+        self.bot = bot
+        self.store = store
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.messages_per_second = messages_per_second
+        self.catch_up = timedelta(hours=catch_up_hours)
+        self.timezone = pytz.timezone(POLAND_TIMEZONE)
+        self._task: Optional[asyncio.Task] = None
+
+    async def _render_groups(self) -> Dict[int, str]:
+        """
+        Render the digest once per subscriber group for its local date
+
+        Returns:
+            Mapping of chat ID to its group's rendered message
+        """
+        groups = await self.store.groups()
+        messages: Dict[int, str] = {}
+
+        for group in groups.values():
+            try:
+                timings = await api.get_timings_by_coordinates(
+                    group.latitude,
+                    group.longitude,
+                    method=group.method,
+                    school=group.school
+                )
+            except AlAdhanAPIError as e:
+                logger.error(f"Digest skipped for {len(group.chat_ids)} chats ({group.city}): {e}")
+                continue
+
+            text = formatter.format_daily_times(
+                timings,
+                city=group.city,
+                timezone=timezones.timezone_name(group.latitude, group.longitude),
+                method=group.method,
+                school=group.school
+            )
+            for chat_id in group.chat_ids:
+                messages[chat_id] = text
+
+        logger.info(f"Digest rendered for {len(groups)} groups, {len(messages)} chats")
+        return messages
+
+    async def _send(self, chat_id: int, text: str) -> bool:
+        """
+        Send digest to one chat, pruning chats that blocked the bot
+
+        Flood limits, network and server errors are retried once; any other
+        failure is logged and counted so one chat can't stop the broadcast.
+
+        Returns:
+            True if the message was delivered
+        """
+        for _ in range(2):
+            try:
+                await self.bot.send_message(chat_id, text, parse_mode="HTML")
+                return True
+            except TelegramRetryAfter as e:
+                logger.warning(f"Flood limit hit, waiting {e.retry_after}s")
+                await asyncio.sleep(e.retry_after)
+            except TelegramForbiddenError:
+                logger.info(f"Chat {chat_id} blocked the bot, unsubscribing")
+                await self.store.unsubscribe(chat_id)
+                return False
+            except TelegramBadRequest as e:
+                if "chat not found" in str(e):
+                    logger.info(f"Chat {chat_id} not found, unsubscribing")
+                    await self.store.unsubscribe(chat_id)
+                else:
+                    logger.error(f"Digest send failed for chat {chat_id}: {e}")
+                return False
+            except (TelegramNetworkError, TelegramServerError) as e:
+                logger.warning(f"Digest send to chat {chat_id} failed, retrying: {e}")
+                await asyncio.sleep(1)
+            except TelegramAPIError as e:
+                logger.error(f"Digest send failed for chat {chat_id}: {e}")
+                return False
+        logger.error(f"Digest send failed for chat {chat_id} after retry")
+        return False
+
+    async def broadcast(self, day: Optional[date_type] = None) -> int:
+        """
+        Send the digest for a day, resuming after the last checkpoint
+
+        Args:
+            day: Broadcast date used for checkpoints (default: today in POLAND_TIMEZONE)
+
+        Returns:
+            Number of messages delivered in this run
+        """
+        if day is None:
+            day = datetime.now(self.timezone).date()
+
+        last_chat_id, finished = await self.store.get_progress(day)
+        if finished:
+            logger.info(f"Digest for {day} already sent")
+            return 0
+
+        messages = await self._render_groups()
+        pending: List[Tuple[int, str]] = sorted(
+            (chat_id, text) for chat_id, text in messages.items()
+            if last_chat_id is None or chat_id > last_chat_id
+        )
+        if last_chat_id is not None:
+            logger.info(f"Resuming digest for {day} after chat {last_chat_id}")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        batch_interval = self.batch_size / self.messages_per_second
+
+        async def send(chat_id: int, text: str) -> bool:
+            async with semaphore:
+                return await self._send(chat_id, text)
+
+        delivered = 0
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            started = asyncio.get_running_loop().time()
+
+            results = await asyncio.gather(
+                *(send(chat_id, text) for chat_id, text in batch),
+                return_exceptions=True
+            )
+            for (chat_id, _), result in zip(batch, results):
+                if isinstance(result, BaseException):
+                    logger.error(f"Digest send failed for chat {chat_id}: {result}")
+            delivered += sum(result is True for result in results)
+            await self.store.save_progress(day, batch[-1][0])
+
+            # Keep a steady send rate below Telegram limits
+            elapsed = asyncio.get_running_loop().time() - started
+            if elapsed < batch_interval:
+                await asyncio.sleep(batch_interval - elapsed)
+
+        await self.store.save_progress(day, pending[-1][0] if pending else (last_chat_id or 0), finished=True)
+        logger.info(f"Digest for {day} delivered to {delivered}/{len(pending)} chats")
+        return delivered
+
+    def _seconds_until_next_run(self) -> float:
+        """Seconds until the next DIGEST_TIME in POLAND_TIMEZONE"""
+        now = datetime.now(self.timezone)
+        run_at = self.timezone.localize(datetime.combine(now.date(), DIGEST_TIME))
+        if run_at <= now:
+            run_at = self.timezone.localize(
+                datetime.combine(now.date() + timedelta(days=1), DIGEST_TIME)
+            )
+        return (run_at - now).total_seconds()
+
+    async def _broadcast_safely(self) -> None:
+        """Run broadcast, logging unexpected errors instead of stopping the loop"""
+        try:
+            await self.broadcast()
+        except Exception as e:
+            logger.error(f"Digest broadcast error: {e}", exc_info=True)
+
+    async def _catch_up(self) -> None:
+        """
+        Send or finish today's digest missed by a restart or a failed run
+
+        A morning schedule is only useful in the morning: past the catch-up
+        window the day is marked finished instead of sent.
+        """
+        now = datetime.now(self.timezone)
+        run_at = self.timezone.localize(datetime.combine(now.date(), DIGEST_TIME))
+        if now < run_at:
+            return
+
+        last_chat_id, finished = await self.store.get_progress(now.date())
+        if finished:
+            return
+        if now - run_at <= self.catch_up:
+            await self._broadcast_safely()
+        else:
+            await self.store.save_progress(now.date(), last_chat_id or 0, finished=True)
+            logger.info(f"Digest for {now.date()} skipped: startup is past the catch-up window")
+
+    async def run(self) -> None:
+        """Resume today's interrupted digest, then send every day at DIGEST_TIME"""
+        try:
+            await self._catch_up()
+        except Exception as e:
+            logger.error(f"Digest catch-up error: {e}", exc_info=True)
+
+        while True:
+            await asyncio.sleep(self._seconds_until_next_run())
+            await self._broadcast_safely()
+
+    def start(self) -> None:
+        """Start the daily broadcast loop in the background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+            logger.info("Digest broadcaster started")
+
+    async def stop(self) -> None:
+        """Stop the broadcast loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Digest broadcaster stopped")
@@ -0,0 +1,105 @@
+"""
+In-memory Cache Utilities
+Bounded LRU cache and location grid cells used as cache keys
+"""
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from config import LOCATION_CELL_DEGREES
+
+
+def location_cell(latitude: float, longitude: float) -> Tuple[int, int]:
+    """
+    Snap coordinates to a grid cell
+
+    Prayer times change by well under a minute inside one cell,
+    so all coordinates in a cell can share cached timings.
+
+    Args:
+        latitude: Location latitude
+        longitude: Location longitude
+
+    Returns:
+        Tuple (row, column) identifying the grid cell
+    """
+    return (
+        round(latitude / LOCATION_CELL_DEGREES),
+        round(longitude / LOCATION_CELL_DEGREES),
+    )
+
+
+def cell_center(cell: Tuple[int, int]) -> Tuple[float, float]:
+    """
+    Get coordinates of a grid cell center
+
+    Args:
+        cell: Tuple (row, column) from location_cell()
+
+    Returns:
+        Tuple (latitude, longitude)
+    """
+    return (
+        round(cell[0] * LOCATION_CELL_DEGREES, 4),
+        round(cell[1] * LOCATION_CELL_DEGREES, 4),
+    )
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry"""
+
+    def __init__(self, max_entries: int):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Maximum number of stored entries
+        """
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get cached value and mark it as recently used
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if missing
+        """
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return None
+        return self._data[key]
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """
+        Get cached value without changing its eviction order
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if missing
+        """
+        return self._data.get(key)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store value, evicting the oldest entry when full
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,236 @@
+"""
+Durable Timings Cache
+SQLite tier under the in-memory caches, so restarts don't start cold
+"""
+import asyncio
+import calendar
+import logging
+import sqlite3
+import threading
+from array import array
+from datetime import date as date_type, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from config import DISK_CACHE_PATH, DISK_CACHE_KEEP_DAYS
+from services.timings import DayTimings, MonthTimings, PRAYERS_PER_DAY
+
+logger = logging.getLogger(__name__)
+
+# Bump when the table layout changes; older cache files are rebuilt from scratch
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS day_timings (
+    cell_lat INTEGER NOT NULL,
+    cell_lon INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    method INTEGER NOT NULL,
+    school INTEGER NOT NULL,
+    minutes BLOB NOT NULL,
+    PRIMARY KEY (cell_lat, cell_lon, method, school, day)
+) WITHOUT ROWID
+"""
+
+
+def _minutes_from_blob(blob: bytes) -> array:
+    """Restore minutes array stored with array.tobytes()"""
+    minutes = array("H")
+    minutes.frombytes(blob)
+    return minutes
+
+
+class DiskCache:
+    """Timings stored by (location cell, date, method, school) in a local SQLite file"""
+
+    def __init__(self, path: str = DISK_CACHE_PATH, keep_days: int = DISK_CACHE_KEEP_DAYS):
+        """
+        Initialize disk cache (the database is opened lazily on first use)
+
+        Args:
+            path: SQLite database file path
+            keep_days: Number of past days kept when compacting (their whole months are kept)
+        """
+        self.path = path
+        self.keep_days = keep_days
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._compacted_on: Optional[date_type] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open database and create schema on first use"""
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != _SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS day_timings")
+                connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            connection.execute(_SCHEMA)
+            connection.commit()
+            self._connection = connection
+            logger.info(f"Disk cache opened: {self.path}")
+        return self._connection
+
+    def _select_days(
+        self,
+        cell: Tuple[int, int],
+        method: int,
+        school: int,
+        first: date_type,
+        last: date_type
+    ) -> List[Tuple[int, bytes]]:
+        with self._lock:
+            return self._connect().execute(
+                "SELECT day, minutes FROM day_timings "
+                "WHERE cell_lat = ? AND cell_lon = ? AND method = ? AND school = ? "
+                "AND day BETWEEN ? AND ? ORDER BY day",
+                (cell[0], cell[1], method, school, first.toordinal(), last.toordinal())
+            ).fetchall()
+
+    def _insert_days(
+        self,
+        cell: Tuple[int, int],
+        method: int,
+        school: int,
+        days: List[DayTimings]
+    ) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.executemany(
+                "INSERT OR REPLACE INTO day_timings (cell_lat, cell_lon, day, method, school, minutes) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (cell[0], cell[1], day.date.toordinal(), method, school, day.minutes.tobytes())
+                    for day in days
+                ]
+            )
+            connection.commit()
+
+    def _delete_before(self, day: date_type) -> int:
+        with self._lock:
+            connection = self._connect()
+            deleted = connection.execute(
+                "DELETE FROM day_timings WHERE day < ?",
+                (day.toordinal(),)
+            ).rowcount
+            connection.commit()
+            return deleted
+
+    async def get_day(
+        self,
+        cell: Tuple[int, int],
+        date: date_type,
+        method: int,
+        school: int
+    ) -> Optional[DayTimings]:
+        """
+        Load timings of one day
+
+        Args:
+            cell: Location cell
+            date: Date of the timings
+            method: Calculation method
+            school: Asr school
+
+        Returns:
+            DayTimings or None if not stored (or the database is unavailable)
+        """
+        try:
+            rows = await asyncio.to_thread(self._select_days, cell, method, school, date, date)
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache read failed: {e}")
+            return None
+
+        if not rows:
+            return None
+        return DayTimings(date, _minutes_from_blob(rows[0][1]))
+
+    async def get_month(
+        self,
+        cell: Tuple[int, int],
+        year: int,
+        month: int,
+        method: int,
+        school: int
+    ) -> Optional[MonthTimings]:
+        """
+        Load timings of a whole month
+
+        Args:
+            cell: Location cell
+            year: Gregorian year
+            month: Gregorian month number
+            method: Calculation method
+            school: Asr school
+
+        Returns:
+            MonthTimings or None if any day of the month is missing
+        """
+        days_in_month = calendar.monthrange(year, month)[1]
+        first = date_type(year, month, 1)
+        last = date_type(year, month, days_in_month)
+
+        try:
+            rows = await asyncio.to_thread(self._select_days, cell, method, school, first, last)
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache read failed: {e}")
+            return None
+
+        if len(rows) != days_in_month:
+            return None
+
+        minutes = array("H")
+        for _, blob in rows:
+            minutes.frombytes(blob)
+        if len(minutes) != days_in_month * PRAYERS_PER_DAY:
+            return None
+        return MonthTimings(year, month, minutes)
+
+    async def put_days(
+        self,
+        cell: Tuple[int, int],
+        method: int,
+        school: int,
+        days: Iterable[DayTimings]
+    ) -> None:
+        """
+        Store timings, compacting past dates once a day
+
+        Args:
+            cell: Location cell
+            method: Calculation method
+            school: Asr school
+            days: Day timings to store
+        """
+        days = list(days)
+        try:
+            await asyncio.to_thread(self._insert_days, cell, method, school, days)
+            await self._compact_if_due()
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache write failed: {e}")
+
+    async def _compact_if_due(self) -> None:
+        """
+        Drop months that ended before keep_days ago, on the first write of each day
+
+        Whole months are kept because get_month() only answers complete months.
+        """
+        today = date_type.today()
+        if self._compacted_on == today:
+            return
+        self._compacted_on = today
+
+        deleted = await asyncio.to_thread(
+            self._delete_before,
+            (today - timedelta(days=self.keep_days)).replace(day=1)
+        )
+        if deleted:
+            logger.info(f"Disk cache compacted: {deleted} days of past months removed")
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
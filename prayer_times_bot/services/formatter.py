@@ -2,11 +2,18 @@
 Message Formatter Service
 Formats prayer times and other messages in Russian with monospace styling
 """
-from datetime import datetime
-from typing import Dict, Optional, List
-import pytz
+from datetime import date as date_type
+from typing import Optional, Sequence
 
-from config import POLAND_TIMEZONE
+from config import (
+    POLAND_TIMEZONE,
+    CALCULATION_METHOD,
+    CALCULATION_METHODS,
+    ASR_SCHOOL,
+    ASR_SCHOOLS,
+)
+from services.next_prayer import NextPrayer
+from services.timings import DayTimings
 
 
 class MessageFormatter:
@@ -35,67 +42,132 @@ class MessageFormatter:
 
     @staticmethod
     def format_daily_times(
-        timings: Dict[str, str],
+        timings: DayTimings,
         city: Optional[str] = None,
-        date: Optional[datetime] = None
+        date: Optional[date_type] = None,
+        timezone: Optional[str] = None,
+        next_prayer: Optional[NextPrayer] = None,
+        method: int = CALCULATION_METHOD,
+        school: int = ASR_SCHOOL
     ) -> str:
         """
         Format daily prayer times in Russian with monospace alignment
 
         Args:
-            timings: Prayer times dictionary from AlAdhan API
+            timings: Typed prayer times for the day
             city: City name (optional)
-            date: Date object (default: today)
+            date: Date object (default: date of the timings)
+            timezone: Local timezone name, shown when it differs from Poland (optional)
+            next_prayer: Upcoming prayer, shown with a countdown (optional)
+            method: Calculation method the timings were computed with
+            school: Asr school the timings were computed with
 
         Returns:
             Formatted message string with HTML markup
         """
         if date is None:
-            date = datetime.now(pytz.timezone(POLAND_TIMEZONE))
+            date = timings.date
 
         # Header
         location_line = f"📍 <b>{city}</b>\n" if city else ""
         date_str = date.strftime("%d.%m.%Y")
         weekday = MessageFormatter._get_russian_weekday(date)
+        timezone_line = (
+            f"🕐 Местное время: {timezone}\n"
+            if timezone and timezone != POLAND_TIMEZONE else ""
+        )
 
         header = f"""🕌 <b>Время намаза</b>
 {location_line}📅 {weekday}, {date_str}
-
+{timezone_line}
 """
 
         # Prayer times - using monospace for alignment
         # Format: emoji Prayer......: HH:MM
         prayer_lines = []
-        prayers = ["Fajr", "Sunrise", "Dhuhr", "Asr", "Maghrib", "Isha"]
 
-        for prayer in prayers:
-            if prayer in timings:
-                emoji = MessageFormatter.PRAYER_EMOJIS.get(prayer, "🕌")
-                name = MessageFormatter.PRAYER_NAMES.get(prayer, prayer)
-                time = timings[prayer]
+        for prayer, time in timings.items():
+            emoji = MessageFormatter.PRAYER_EMOJIS.get(prayer, "🕌")
+            name = MessageFormatter.PRAYER_NAMES.get(prayer, prayer)
 
-                # Create aligned formatting with monospace
-                # Use dots for visual alignment (mimics JetBrains Mono spacing)
-                padding = "." * (12 - len(name))
-                prayer_lines.append(f"{emoji} <code>{name}{padding}: {time}</code>")
+            # Create aligned formatting with monospace
+            # Use dots for visual alignment (mimics JetBrains Mono spacing)
+            padding = "." * (12 - len(name))
+            prayer_lines.append(f"{emoji} <code>{name}{padding}: {time}</code>")
 
         times_block = "\n".join(prayer_lines)
 
+        if next_prayer is not None:
+            times_block += "\n\n" + MessageFormatter.format_next_prayer_line(next_prayer)
+
         # Footer
-        footer = f"\n\n<i>📖 Метод: Всемирная Мусульманская Лига</i>\n<i>   (Фаджр: 18°, Иша: 17°)</i>"
+        footer = "\n\n" + MessageFormatter.format_method_footer(method, school)
 
         return header + times_block + footer
 
+    @staticmethod
+    def format_method_footer(method: int, school: int) -> str:
+        """
+        Format calculation method note shown under the daily times
+
+        Args:
+            method: AlAdhan calculation method ID
+            school: AlAdhan Asr school ID
+
+        Returns:
+            Formatted footer with HTML markup
+        """
+        name, params = CALCULATION_METHODS.get(method, (f"№{method}", None))
+        footer = f"<i>📖 Метод: {name}</i>"
+        if params:
+            footer += f"\n<i>   ({params})</i>"
+        if school != ASR_SCHOOL:
+            footer += f"\n<i>   Аср: {ASR_SCHOOLS.get(school, school)}</i>"
+        return footer
+
+    @staticmethod
+    def format_next_prayer_line(next_prayer: NextPrayer) -> str:
+        """
+        Format one-line countdown to the next prayer
+
+        Args:
+            next_prayer: Upcoming prayer
+
+        Returns:
+            Formatted line with HTML markup
+        """
+        emoji = MessageFormatter.PRAYER_EMOJIS.get(next_prayer.prayer, "🕌")
+        name = MessageFormatter.PRAYER_NAMES.get(next_prayer.prayer, next_prayer.prayer)
+        remaining = MessageFormatter._format_duration(next_prayer.minutes_left)
+        return f"⏭ Далее: {emoji} <b>{name}</b> в {next_prayer.time} (через {remaining})"
+
+    @staticmethod
+    def format_next_prayer(next_prayer: NextPrayer, city: Optional[str] = None) -> str:
+        """
+        Format reply to the /next command
+
+        Args:
+            next_prayer: Upcoming prayer
+            city: City name (optional)
+
+        Returns:
+            Formatted message string with HTML markup
+        """
+        location_line = f"📍 <b>{city}</b>\n" if city else ""
+        return f"""🕌 <b>Следующий намаз</b>
+{location_line}
+{MessageFormatter.format_next_prayer_line(next_prayer)}"""
+
     @staticmethod
     def format_weekly_times(
-        calendar_data: List[Dict],
+        days: Sequence[DayTimings],
         city: Optional[str] = None
     ) -> str:
         """
         Format weekly prayer times (7 days) in compact format
 
         Args:
-            calendar_data: List of daily prayer times from AlAdhan API
+            days: Typed prayer times for consecutive days
             city: City name (optional)
 
         Returns:
@@ -108,14 +180,12 @@ class MessageFormatter:
 
         # Format each day compactly
         lines = []
-        for day_data in calendar_data[:7]:  # First 7 days
-            date_obj = datetime.fromtimestamp(int(day_data["date"]["timestamp"]))
-            date_str = date_obj.strftime("%d.%m")
-            weekday_short = MessageFormatter._get_russian_weekday_short(date_obj)
+        for day in days[:7]:  # First 7 days
+            date_str = day.date.strftime("%d.%m")
+            weekday_short = MessageFormatter._get_russian_weekday_short(day.date)
 
-            timings = day_data["timings"]
-            fajr = timings["Fajr"]
-            maghrib = timings["Maghrib"]
+            fajr = day["Fajr"]
+            maghrib = day["Maghrib"]
 
             # Compact format: Date Weekday Fajr-Maghrib
             lines.append(f"<code>{date_str} {weekday_short} │ {fajr} - {maghrib}</code>")
@@ -126,6 +196,87 @@ class MessageFormatter:
 
         return header + times_block + footer
 
+    @staticmethod
+    def format_month_page(
+        days: Sequence[DayTimings],
+        year: int,
+        month: int,
+        page: int,
+        pages: int,
+        city: Optional[str] = None
+    ) -> str:
+        """
+        Format one page of the monthly schedule in compact table format
+
+        Args:
+            days: Typed prayer times for the days on this page
+            year: Gregorian year
+            month: Gregorian month number
+            page: Page index (0-based)
+            pages: Total number of pages
+            city: City name (optional)
+
+        Returns:
+            Formatted message string with HTML markup
+        """
+        location_line = f"📍 <b>{city}</b>\n" if city else ""
+        month_name = MessageFormatter._get_russian_month(month)
+        header = f"""🕌 <b>Время намаза на месяц</b>
+{location_line}🗓 {month_name} {year} · стр. {page + 1}/{pages}
+
+"""
+
+        # Sunrise is omitted to keep rows narrow on mobile screens
+        lines = ["<code>Дата  │ Фадж  Зухр  Аср   Магр  Иша</code>"]
+        for day in days:
+            date_str = day.date.strftime("%d")
+            weekday_short = MessageFormatter._get_russian_weekday_short(day.date)
+            times = " ".join(
+                day[prayer] for prayer in ("Fajr", "Dhuhr", "Asr", "Maghrib", "Isha")
+            )
+            lines.append(f"<code>{date_str} {weekday_short} │ {times}</code>")
+
+        times_block = "\n".join(lines)
+
+        footer = "\n\n<i>Восход: см. /today</i>"
+
+        return header + times_block + footer
+
+    @staticmethod
+    def format_ramadan_day(
+        date: date_type,
+        day_number: int,
+        suhoor: str,
+        iftar: str,
+        city: Optional[str] = None,
+        next_suhoor: Optional[str] = None
+    ) -> str:
+        """
+        Format compact suhoor/iftar message for a day of Ramadan
+
+        Args:
+            date: Gregorian date of the fast
+            day_number: Day of Ramadan (1-based)
+            suhoor: End of suhoor (Fajr) in HH:MM format
+            iftar: Iftar (Maghrib) in HH:MM format
+            city: City name (optional)
+            next_suhoor: End of tomorrow's suhoor, if tomorrow is a fast (optional)
+
+        Returns:
+            Formatted message string with HTML markup
+        """
+        location = f"📍 <b>{city}</b> · " if city else "📅 "
+        weekday_short = MessageFormatter._get_russian_weekday_short(date)
+        next_line = (
+            f"\n<i>Завтра сухур до {next_suhoor}</i>" if next_suhoor else ""
+        )
+
+        return f"""🌙 <b>Рамадан, день {day_number}</b>
+{location}{weekday_short}, {date.strftime("%d.%m")}
+
+<code>🍽 Сухур до : {suhoor}</code>
+<code>🌆 Ифтар    : {iftar}</code>{next_line}"""
+
     @staticmethod
     def format_welcome_message() -> str:
         """Welcome message in Russian"""
@@ -148,6 +299,8 @@ class MessageFormatter:
 /start - Начать работу
 /today - Время на сегодня
 /week - Расписание на неделю
+/next - Следующий намаз
+/method - Метод расчёта
 /cities - Выбрать город"""
 
     @staticmethod
@@ -169,7 +322,15 @@ class MessageFormatter:
 Выберите город из списка ниже или поделитесь своим местоположением для точного расчёта."""
 
     @staticmethod
-    def _get_russian_weekday(date: datetime) -> str:
+    def _format_duration(minutes: int) -> str:
+        """Format duration in minutes, e.g. 1 ч 23 мин"""
+        hours, minutes = divmod(minutes, 60)
+        if hours:
+            return f"{hours} ч {minutes} мин"
+        return f"{minutes} мин"
+
+    @staticmethod
+    def _get_russian_weekday(date: date_type) -> str:
         """Get Russian weekday name"""
         weekdays = {
             0: "Понедельник",
@@ -183,7 +344,26 @@ class MessageFormatter:
         return weekdays[date.weekday()]
 
     @staticmethod
-    def _get_russian_weekday_short(date: datetime) -> str:
+    def _get_russian_month(month: int) -> str:
+        """Get Russian month name in nominative case"""
+        months = {
+            1: "Январь",
+            2: "Февраль",
+            3: "Март",
+            4: "Апрель",
+            5: "Май",
+            6: "Июнь",
+            7: "Июль",
+            8: "Август",
+            9: "Сентябрь",
+            10: "Октябрь",
+            11: "Ноябрь",
+            12: "Декабрь",
+        }
+        return months[month]
+
+    @staticmethod
+    def _get_russian_weekday_short(date: date_type) -> str:
         """Get Russian weekday short name"""
         weekdays = {
             0: "Пн",
@@ -0,0 +1,301 @@
+"""
+Read-only HTTP API
+Serves the bot's cached prayer times to other local services
+"""
+import hashlib
+import json
+import logging
+import time
+from datetime import date as date_type, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from aiohttp import web
+
+from config import (
+    POLISH_CITIES,
+    CALCULATION_METHODS,
+    ASR_SCHOOLS,
+    HTTP_API_HOST,
+    HTTP_API_PORT,
+    HTTP_API_RATE_PER_MINUTE,
+    HTTP_API_MAX_AGE,
+    CACHE_MAX_ENTRIES,
+)
+from services.aladhan_api import api, AlAdhanAPIError
+from services.cache import LRUCache
+from services.metrics import metrics
+from services.timezones import timezones
+from services.timings import DayTimings
+
+logger = logging.getLogger(__name__)
+
+# City lookup that ignores letter case ("warszawa", "WARSZAWA")
+_CITIES = {name.lower(): name for name in POLISH_CITIES}
+
+
+class _BadRequest(Exception):
+    """Invalid query parameter, reported to the client as 400"""
+
+
+class _TokenBucket:
+    """Request allowance of one client, refilled continuously"""
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class HttpApiServer:
+    """aiohttp server exposing /timings and /calendar from the shared caches"""
+
+    def __init__(
+        self,
+        host: str = HTTP_API_HOST,
+        port: int = HTTP_API_PORT,
+        rate_per_minute: int = HTTP_API_RATE_PER_MINUTE,
+        max_age: int = HTTP_API_MAX_AGE
+    ):
+        """
+        Initialize server
+
+        Args:
+            host: Interface to listen on
+            port: TCP port to listen on
+            rate_per_minute: Requests allowed per client per minute (also the burst size)
+            max_age: Cache-Control max-age of responses, in seconds
+        """
+        self.host = host
+        self.port = port
+        self.rate_per_minute = rate_per_minute
+        self.max_age = max_age
+        # Token buckets keyed by client address
+        self._buckets = LRUCache(CACHE_MAX_ENTRIES)
+        self._runner: Optional[web.AppRunner] = None
+
+        self.app = web.Application(middlewares=[self._rate_limit])
+        self.app.router.add_get("/timings", self.handle_timings)
+        self.app.router.add_get("/calendar", self.handle_calendar)
+
+    def _allow(self, client: str) -> Tuple[bool, float]:
+        """
+        Take one request from the client's bucket
+
+        Returns:
+            Tuple (allowed, seconds until the next request is allowed)
+        """
+        now = time.monotonic()
+        refill_per_second = self.rate_per_minute / 60
+        bucket: Optional[_TokenBucket] = self._buckets.get(client)
+        if bucket is None:
+            bucket = _TokenBucket(self.rate_per_minute, now)
+            self._buckets.set(client, bucket)
+
+        bucket.tokens = min(
+            self.rate_per_minute,
+            bucket.tokens + (now - bucket.updated) * refill_per_second
+        )
+        bucket.updated = now
+
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            return True, 0.0
+        return False, (1 - bucket.tokens) / refill_per_second
+
+    @web.middleware
+    async def _rate_limit(self, request: web.Request, handler) -> web.StreamResponse:
+        """Reject clients over their rate with 429 and Retry-After"""
+        allowed, retry_after = self._allow(request.remote or "unknown")
+        if not allowed:
+            metrics.increment("http_api.rate_limited")
+            return web.json_response(
+                {"error": "rate limit exceeded"},
+                status=429,
+                headers={"Retry-After": str(max(1, round(retry_after)))}
+            )
+
+        metrics.increment("http_api.requests")
+        started = time.monotonic()
+        try:
+            return await handler(request)
+        finally:
+            metrics.observe("http_api.latency", time.monotonic() - started)
+
+    @staticmethod
+    def _location(request: web.Request) -> Tuple[float, float, Optional[str]]:
+        """Read city or lat/lon query parameters"""
+        city = request.query.get("city")
+        if city is not None:
+            name = _CITIES.get(city.strip().lower())
+            if name is None:
+                raise _BadRequest(f"unknown city: {city}")
+            latitude, longitude = POLISH_CITIES[name]
+            return latitude, longitude, name
+
+        try:
+            latitude = float(request.query["lat"])
+            longitude = float(request.query["lon"])
+        except (KeyError, ValueError):
+            raise _BadRequest("pass city=<name> or lat=<float>&lon=<float>")
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise _BadRequest("coordinates out of range")
+        return latitude, longitude, None
+
+    @staticmethod
+    def _settings(request: web.Request) -> Tuple[int, int]:
+        """Read optional method and school query parameters"""
+        try:
+            method = int(request.query.get("method", api.method))
+            school = int(request.query.get("school", api.school))
+        except ValueError:
+            raise _BadRequest("method and school must be integers")
+        if method not in CALCULATION_METHODS:
+            raise _BadRequest(f"unsupported method: {method}")
+        if school not in ASR_SCHOOLS:
+            raise _BadRequest(f"unsupported school: {school}")
+        return method, school
+
+    @staticmethod
+    def _day_json(timings: DayTimings) -> Dict[str, Any]:
+        return {"date": timings.date.isoformat(), "timings": dict(timings.items())}
+
+    def _max_age_until_midnight(self, latitude: float, longitude: float) -> int:
+        """
+        Cache lifetime of a response for "today", which must expire at local midnight
+
+        Args:
+            latitude: Location latitude
+            longitude: Location longitude
+
+        Returns:
+            max-age in seconds, at most the configured one
+        """
+        timezone = timezones.timezone(latitude, longitude)
+        now = datetime.now(timezone)
+        midnight = timezone.localize(datetime.combine(now.date() + timedelta(days=1), datetime.min.time()))
+        return max(0, min(self.max_age, int((midnight - now).total_seconds())))
+
+    def _respond(self, request: web.Request, payload: Dict[str, Any], max_age: int) -> web.Response:
+        """Serialize payload with ETag and Cache-Control, answering 304 on a match"""
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={max_age}",
+        }
+
+        if etag in request.headers.get("If-None-Match", ""):
+            metrics.increment("http_api.not_modified")
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=body, content_type="application/json", charset="utf-8", headers=headers)
+
+    async def _serve(self, request: web.Request, build) -> web.Response:
+        """Run a (payload, max-age) builder, mapping errors to JSON responses"""
+        try:
+            return self._respond(request, *await build())
+        except _BadRequest as e:
+            return web.json_response({"error": str(e)}, status=400)
+        except AlAdhanAPIError as e:
+            logger.error(f"HTTP API upstream error for {request.path_qs}: {e}")
+            return web.json_response({"error": "upstream unavailable"}, status=502)
+
+    async def handle_timings(self, request: web.Request) -> web.Response:
+        """
+        GET /timings?city=<name>|lat=<float>&lon=<float>[&date=YYYY-MM-DD][&method=][&school=]
+        """
+        async def build() -> Tuple[Dict[str, Any], int]:
+            latitude, longitude, city = self._location(request)
+            method, school = self._settings(request)
+            day = None
+            if "date" in request.query:
+                try:
+                    day = date_type.fromisoformat(request.query["date"])
+                except ValueError:
+                    raise _BadRequest("date must be YYYY-MM-DD")
+
+            timings = await api.get_timings_by_coordinates(
+                latitude,
+                longitude,
+                date=day,
+                method=method,
+                school=school
+            )
+            payload = {
+                "city": city,
+                "timezone": timezones.timezone_name(latitude, longitude),
+                "method": method,
+                "school": school,
+                **self._day_json(timings),
+            }
+            # Without a date the response means "today" and goes stale at local midnight
+            if day is None:
+                return payload, self._max_age_until_midnight(latitude, longitude)
+            return payload, self.max_age
+
+        return await self._serve(request, build)
+
+    async def handle_calendar(self, request: web.Request) -> web.Response:
+        """
+        GET /calendar?city=<name>|lat=<float>&lon=<float>[&year=][&month=][&method=][&school=]
+        """
+        async def build() -> Tuple[Dict[str, Any], int]:
+            latitude, longitude, city = self._location(request)
+            method, school = self._settings(request)
+            try:
+                year = int(request.query["year"]) if "year" in request.query else None
+                month = int(request.query["month"]) if "month" in request.query else None
+            except ValueError:
+                raise _BadRequest("year and month must be integers")
+            if month is not None and not 1 <= month <= 12:
+                raise _BadRequest("month must be 1-12")
+            today = timezones.local_today(latitude, longitude)
+            if year is not None and abs(year - today.year) > 1:
+                raise _BadRequest(f"year must be {today.year - 1}-{today.year + 1}")
+
+            # Only the current month is shared with the bot's replies; other months
+            # go through the disk cache so scanning clients don't evict hot entries
+            current = (year or today.year, month or today.month) == (today.year, today.month)
+            calendar = await api.get_monthly_calendar(
+                latitude,
+                longitude,
+                month=month,
+                year=year,
+                method=method,
+                school=school,
+                fill_cache=current
+            )
+            payload = {
+                "city": city,
+                "timezone": timezones.timezone_name(latitude, longitude),
+                "method": method,
+                "school": school,
+                "year": calendar.year,
+                "month": calendar.month,
+                "days": [self._day_json(day) for day in calendar],
+            }
+            # Without year or month the response means "this month" and may change at local midnight
+            if year is None or month is None:
+                return payload, self._max_age_until_midnight(latitude, longitude)
+            return payload, self.max_age
+
+        return await self._serve(request, build)
+
+    async def start(self) -> None:
+        """Start listening in the background"""
+        if self._runner is None:
+            self._runner = web.AppRunner(self.app, access_log=None)
+            await self._runner.setup()
+            await web.TCPSite(self._runner, self.host, self.port).start()
+            logger.info(f"HTTP API listening on http://{self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        """Stop the server"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            logger.info("HTTP API stopped")
+
+
+# Global HTTP API server
+http_api = HttpApiServer()
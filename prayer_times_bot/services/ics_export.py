@@ -0,0 +1,199 @@
+"""
+Calendar Export Service
+Builds a year of prayer times as an iCalendar (.ics) file
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional
+
+import pytz
+
+from config import EXPORT_CACHE_ENTRIES, EXPORT_EVENT_MINUTES
+from services.aladhan_api import api
+from services.cache import LRUCache, location_cell
+from services.formatter import formatter
+from services.timezones import timezones
+from services.timings import PRAYERS
+
+logger = logging.getLogger(__name__)
+
+# RFC 5545 limits content lines to 75 octets, excluding the line break
+_MAX_LINE_OCTETS = 75
+
+
+def _escape(text: str) -> str:
+    """Escape a TEXT property value"""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> bytes:
+    """
+    Encode a content line, folding it at 75 octets without splitting characters
+
+    Args:
+        line: Content line without the line break
+
+    Returns:
+        UTF-8 bytes ending with CRLF
+    """
+    encoded = line.encode("utf-8")
+    if len(encoded) <= _MAX_LINE_OCTETS:
+        return encoded + b"\r\n"
+
+    parts = []
+    current = b""
+    limit = _MAX_LINE_OCTETS
+    for char in line:
+        char_bytes = char.encode("utf-8")
+        if len(current) + len(char_bytes) > limit:
+            parts.append(current)
+            current = b""
+            # Continuation lines start with a space, which counts towards the limit
+            limit = _MAX_LINE_OCTETS - 1
+        current += char_bytes
+    parts.append(current)
+    return b"\r\n ".join(parts) + b"\r\n"
+
+
+def _format_utc(moment: datetime) -> str:
+    """Format an aware datetime as an iCalendar UTC timestamp"""
+    return moment.astimezone(pytz.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+class IcsExporter:
+    """Builds yearly .ics files and caches them per location, year and settings"""
+
+    def __init__(
+        self,
+        max_entries: int = EXPORT_CACHE_ENTRIES,
+        event_minutes: int = EXPORT_EVENT_MINUTES
+    ):
+        """
+        Initialize exporter
+
+        Args:
+            max_entries: Maximum number of generated files kept in memory
+            event_minutes: Duration of each prayer event
+        """
+        self.event_minutes = event_minutes
+        # Encoded files keyed by (location cell, city, year, method, school)
+        self._files = LRUCache(max_entries)
+
+    async def _iter_lines(
+        self,
+        latitude: float,
+        longitude: float,
+        year: int,
+        city: Optional[str],
+        method: int,
+        school: int
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield encoded calendar lines, loading one monthly calendar at a time
+
+        Months are read from the disk cache (or an already cached month)
+        without filling the in-memory caches, so an export does not evict
+        the entries the bot replies depend on.
+        """
+        timezone = timezones.timezone(latitude, longitude)
+        cell = location_cell(latitude, longitude)
+        stamp = _format_utc(datetime.now(pytz.utc))
+        duration = timedelta(minutes=self.event_minutes)
+        place = city or f"{latitude:.4f}, {longitude:.4f}"
+
+        yield _fold("BEGIN:VCALENDAR")
+        yield _fold("VERSION:2.0")
+        yield _fold("PRODID:-//Prayer Times Bot//RU")
+        yield _fold("CALSCALE:GREGORIAN")
+        yield _fold(f"X-WR-CALNAME:{_escape(f'Время намаза · {place} · {year}')}")
+
+        for month in range(1, 13):
+            calendar = await api.get_monthly_calendar(
+                latitude,
+                longitude,
+                month=month,
+                year=year,
+                method=method,
+                school=school,
+                fill_cache=False
+            )
+            for day in calendar:
+                midnight = datetime.combine(day.date, datetime.min.time())
+                for prayer in PRAYERS:
+                    # Minutes past midnight fall on the next local day
+                    start = timezone.localize(midnight + timedelta(minutes=day.minute_of(prayer)))
+                    emoji = formatter.PRAYER_EMOJIS.get(prayer, "🕌")
+                    name = formatter.PRAYER_NAMES.get(prayer, prayer)
+
+                    yield _fold("BEGIN:VEVENT")
+                    yield _fold(
+                        f"UID:{day.date.isoformat()}-{prayer.lower()}-{cell[0]}-{cell[1]}"
+                        f"-{method}-{school}@prayer-times-bot"
+                    )
+                    yield _fold(f"DTSTAMP:{stamp}")
+                    yield _fold(f"DTSTART:{_format_utc(start)}")
+                    yield _fold(f"DTEND:{_format_utc(start + duration)}")
+                    yield _fold(f"SUMMARY:{_escape(f'{emoji} {name}')}")
+                    yield _fold(f"LOCATION:{_escape(place)}")
+                    yield _fold("TRANSP:TRANSPARENT")
+                    yield _fold("END:VEVENT")
+
+        yield _fold("END:VCALENDAR")
+
+    async def export_year(
+        self,
+        latitude: float,
+        longitude: float,
+        year: int,
+        city: Optional[str] = None,
+        method: Optional[int] = None,
+        school: Optional[int] = None
+    ) -> bytes:
+        """
+        Get the .ics file of a year, generating it on first request
+
+        Args:
+            latitude: Location latitude
+            longitude: Location longitude
+            year: Gregorian year
+            city: City name used in event locations (optional)
+            method: Calculation method (default: client default)
+            school: Asr school (default: client default)
+
+        Returns:
+            Encoded iCalendar file
+
+        Raises:
+            AlAdhanAPIError: If a month is not cached and the request fails
+        """
+        method = api.method if method is None else method
+        school = api.school if school is None else school
+
+        key = (location_cell(latitude, longitude), city, year, method, school)
+        cached = self._files.get(key)
+        if cached is not None:
+            return cached
+
+        # The whole file is kept for the LRU and the upload, so lines are simply joined
+        data = b"".join([
+            line async for line in self._iter_lines(latitude, longitude, year, city, method, school)
+        ])
+
+        self._files.set(key, data)
+        logger.info(f"Calendar export built for {city or key[0]} {year}: {len(data)} bytes")
+        return data
+
+    @staticmethod
+    def filename(year: int, city: Optional[str] = None) -> str:
+        """File name shown in Telegram for an export"""
+        place = city.lower() if city else "location"
+        return f"prayer-times-{place}-{year}.ics"
+
+
+# Global exporter instance
+ics_exporter = IcsExporter()
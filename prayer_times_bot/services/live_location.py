@@ -0,0 +1,107 @@
+"""
+Live Location Tracker
+Remembers where each live location was last computed for
+"""
+import time
+from datetime import date as date_type
+from typing import Optional, Tuple
+
+from aiogram.types import Message
+
+from config import CACHE_MAX_ENTRIES
+from services.cache import LRUCache
+
+
+class LiveSession:
+    """State of one shared live location"""
+
+    __slots__ = ("cell", "date", "reply", "expires_at")
+
+    def __init__(self, cell: Tuple[int, int], date: date_type, reply: Message, expires_at: float):
+        """
+        Initialize session
+
+        Args:
+            cell: Location cell the shown times were computed for
+            date: Local date the shown times were computed for
+            reply: Bot message showing the times, edited on updates
+            expires_at: Unix time when the live period ends
+        """
+        self.cell = cell
+        self.date = date
+        self.reply = reply
+        self.expires_at = expires_at
+
+    def mark_shown(self, cell: Tuple[int, int], date: date_type) -> None:
+        """
+        Record the cell and date the reply now shows
+
+        Call only after the reply was refreshed, so a failed or superseded
+        refresh is retried by the next update.
+
+        Args:
+            cell: Location cell the new times were computed for
+            date: Local date the new times were computed for
+        """
+        self.cell = cell
+        self.date = date
+
+
+class LiveLocationTracker:
+    """Tracks live locations by (chat ID, location message ID)"""
+
+    def __init__(self):
+        self._sessions = LRUCache(CACHE_MAX_ENTRIES)
+
+    def start(
+        self,
+        location_message: Message,
+        cell: Tuple[int, int],
+        date: date_type,
+        reply: Message
+    ) -> None:
+        """
+        Start tracking a live location message
+
+        Args:
+            location_message: User's message with live location
+            cell: Location cell the times were computed for
+            date: Local date the times were computed for
+            reply: Bot message showing the times
+        """
+        expires_at = location_message.date.timestamp() + location_message.location.live_period
+        key = (location_message.chat.id, location_message.message_id)
+        self._sessions.set(key, LiveSession(cell, date, reply, expires_at))
+
+    def needs_update(
+        self,
+        location_message: Message,
+        cell: Tuple[int, int],
+        date: date_type
+    ) -> Optional[LiveSession]:
+        """
+        Check whether a live location update moved to a new cell or day
+
+        Only compares; the caller records the new cell and date with
+        LiveSession.mark_shown() once the reply was refreshed.
+
+        Args:
+            location_message: Edited message with the new location
+            cell: Location cell of the new position
+            date: Local date at the new position
+
+        Returns:
+            Session whose reply should be refreshed, or None to ignore the update
+        """
+        session: Optional[LiveSession] = self._sessions.get(
+            (location_message.chat.id, location_message.message_id)
+        )
+        if session is None or time.time() > session.expires_at:
+            return None
+        if session.cell == cell and session.date == date:
+            return None
+        return session
+
+
+# Global live location tracker
+live_locations = LiveLocationTracker()
@@ -0,0 +1,103 @@
+"""
+Metrics Service
+Lightweight in-process counters and latency stats, logged periodically
+"""
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from config import METRICS_LOG_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyStats:
+    """Count, total and maximum of observed durations"""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class Metrics:
+    """Registry of named counters and latency stats"""
+
+    def __init__(self):
+        self.counters: Dict[str, int] = {}
+        self.latencies: Dict[str, LatencyStats] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """
+        Increase a counter
+
+        Args:
+            name: Counter name
+            value: Amount to add
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """
+        Record a duration
+
+        Args:
+            name: Metric name
+            seconds: Observed duration in seconds
+        """
+        stats = self.latencies.get(name)
+        if stats is None:
+            stats = self.latencies[name] = LatencyStats()
+        stats.observe(seconds)
+
+    def summary(self) -> str:
+        """Human-readable summary of all metrics"""
+        lines = [f"{name}={value}" for name, value in sorted(self.counters.items())]
+        lines.extend(
+            f"{name}: n={stats.count} avg={stats.average * 1000:.1f}ms max={stats.max * 1000:.1f}ms"
+            for name, stats in sorted(self.latencies.items())
+        )
+        return "; ".join(lines) if lines else "no data"
+
+    def reset(self) -> None:
+        """Clear all metrics"""
+        self.counters.clear()
+        self.latencies.clear()
+
+    async def _report(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            logger.info(f"Metrics ({interval:.0f}s): {self.summary()}")
+            self.reset()
+
+    def start_reporting(self, interval: float = METRICS_LOG_INTERVAL) -> None:
+        """Log and reset metrics every interval seconds in the background"""
+        if self._task is None and interval > 0:
+            self._task = asyncio.create_task(self._report(interval))
+
+    async def stop_reporting(self) -> None:
+        """Stop periodic logging"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global metrics registry
+metrics = Metrics()
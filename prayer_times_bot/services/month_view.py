@@ -0,0 +1,91 @@
+"""
+Month View Service
+Pre-renders paginated monthly schedules from cached calendar data
+"""
+from typing import Optional, Tuple
+
+from config import CACHE_MAX_ENTRIES, MONTH_PAGE_DAYS
+from services.aladhan_api import api
+from services.cache import LRUCache, location_cell
+from services.formatter import formatter
+
+
+class MonthView:
+    """Renders all pages of a month at once and caches them per location"""
+
+    def __init__(self, page_days: int = MONTH_PAGE_DAYS):
+        """
+        Initialize month view
+
+        Args:
+            page_days: Number of days shown on one page
+        """
+        self.page_days = page_days
+        # Rendered pages keyed by (location cell, city, year, month, method, school)
+        self._pages = LRUCache(CACHE_MAX_ENTRIES)
+
+    async def get_pages(
+        self,
+        latitude: float,
+        longitude: float,
+        year: int,
+        month: int,
+        city: Optional[str] = None,
+        method: Optional[int] = None,
+        school: Optional[int] = None
+    ) -> Tuple[str, ...]:
+        """
+        Get rendered pages of a month, loading the calendar on first use
+
+        Args:
+            latitude: Location latitude
+            longitude: Location longitude
+            year: Gregorian year
+            month: Gregorian month number
+            city: City name shown in the header (optional)
+            method: Calculation method (default: client default)
+            school: Asr school (default: client default)
+
+        Returns:
+            Tuple of HTML page texts
+
+        Raises:
+            AlAdhanAPIError: If the calendar is not cached and the request fails
+        """
+        method = api.method if method is None else method
+        school = api.school if school is None else school
+
+        key = (location_cell(latitude, longitude), city, year, month, method, school)
+        pages = self._pages.get(key)
+        if pages is not None:
+            return pages
+
+        calendar = await api.get_monthly_calendar(
+            latitude,
+            longitude,
+            month=month,
+            year=year,
+            method=method,
+            school=school
+        )
+
+        days = calendar.days()
+        chunks = [
+            days[start:start + self.page_days]
+            for start in range(0, len(days), self.page_days)
+        ]
+        pages = tuple(
+            formatter.format_month_page(chunk, year, month, index, len(chunks), city=city)
+            for index, chunk in enumerate(chunks)
+        )
+
+        self._pages.set(key, pages)
+        return pages
+
+    def page_of_day(self, day: int) -> int:
+        """Get index of the page that contains a day of month"""
+        return (day - 1) // self.page_days
+
+
+# Global month view instance
+month_view = MonthView()
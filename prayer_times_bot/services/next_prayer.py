@@ -0,0 +1,81 @@
+"""
+Next Prayer Service
+Finds the upcoming prayer and time remaining from cached typed timings
+"""
+from datetime import timedelta
+from typing import Optional
+
+from services.aladhan_api import api
+from services.timezones import timezones
+from services.timings import DayTimings, find_next_prayer, format_minutes
+
+
+class NextPrayer:
+    """Upcoming prayer with its local time and minutes remaining"""
+
+    __slots__ = ("prayer", "time", "minutes_left")
+
+    def __init__(self, prayer: str, time: str, minutes_left: int):
+        """
+        Initialize next prayer
+
+        Args:
+            prayer: Prayer name from PRAYER_ORDER
+            time: Local time in HH:MM format
+            minutes_left: Minutes remaining until the prayer
+        """
+        self.prayer = prayer
+        self.time = time
+        self.minutes_left = minutes_left
+
+
+async def get_next_prayer(
+    latitude: float,
+    longitude: float,
+    today: Optional[DayTimings] = None,
+    method: Optional[int] = None,
+    school: Optional[int] = None
+) -> NextPrayer:
+    """
+    Get the next prayer at a location
+
+    Tomorrow's timings are only requested after today's last prayer;
+    both are normally cache hits thanks to the warmed monthly calendars.
+
+    Args:
+        latitude: Location latitude
+        longitude: Location longitude
+        today: Today's timings if already loaded (optional)
+        method: Calculation method (default: client default)
+        school: Asr school (default: client default)
+
+    Returns:
+        NextPrayer instance
+
+    Raises:
+        AlAdhanAPIError: If timings are not cached and the request fails
+    """
+    now = timezones.local_now(latitude, longitude)
+    if today is None or today.date != now.date():
+        today = await api.get_timings_by_coordinates(
+            latitude,
+            longitude,
+            date=now.date(),
+            method=method,
+            school=school
+        )
+
+    minute = now.hour * 60 + now.minute
+    upcoming = find_next_prayer(today, None, minute)
+    if upcoming is None:
+        tomorrow = await api.get_timings_by_coordinates(
+            latitude,
+            longitude,
+            date=now.date() + timedelta(days=1),
+            method=method,
+            school=school
+        )
+        upcoming = find_next_prayer(today, tomorrow, minute)
+
+    prayer, minutes_left = upcoming
+    return NextPrayer(prayer, format_minutes(minute + minutes_left), minutes_left)
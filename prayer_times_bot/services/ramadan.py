@@ -0,0 +1,314 @@
+"""
+Ramadan Surge Mode
+Precomputes suhoor/iftar tables for the whole month and pre-renders city messages,
+so the Fajr and Maghrib rush is served without upstream calls
+"""
+import asyncio
+import logging
+from array import array
+from datetime import date as date_type, datetime, timedelta
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import pytz
+
+from config import (
+    POLISH_CITIES,
+    POLAND_TIMEZONE,
+    RAMADAN_START,
+    RAMADAN_END,
+    RAMADAN_PREPARE_DAYS,
+    RAMADAN_HOT_CELLS,
+    WARMER_CONCURRENCY,
+    WARMER_TOP_METHODS,
+)
+from services.aladhan_api import api, AlAdhanAPIError
+from services.cache import cell_center, location_cell
+from services.formatter import formatter
+from services.metrics import metrics
+from services.timings import format_minutes
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_date(value: str) -> Optional[date_type]:
+    """Parse optional ISO date from configuration"""
+    return date_type.fromisoformat(value) if value else None
+
+
+class RamadanSchedule:
+    """Suhoor (Fajr) and iftar (Maghrib) times for every day of Ramadan"""
+
+    def __init__(
+        self,
+        first_day: Optional[date_type] = _parse_date(RAMADAN_START),
+        last_day: Optional[date_type] = _parse_date(RAMADAN_END),
+        prepare_days: int = RAMADAN_PREPARE_DAYS,
+        hot_cells: int = RAMADAN_HOT_CELLS,
+        top_methods: int = WARMER_TOP_METHODS,
+        concurrency: int = WARMER_CONCURRENCY
+    ):
+        """
+        Initialize schedule
+
+        Args:
+            first_day: Date of the first fast (None disables the mode)
+            last_day: Date of the last fast
+            prepare_days: Days before the start when tables are precomputed
+            hot_cells: Number of most requested location cells to precompute besides cities
+            top_methods: Number of most requested (method, school) pairs to precompute for cities
+            concurrency: Maximum simultaneous upstream requests while precomputing
+        """
+        self.first_day = first_day
+        self.last_day = last_day
+        self.prepare_days = prepare_days
+        self.hot_cells = hot_cells
+        self.top_methods = top_methods
+        self.concurrency = concurrency
+        self.timezone = pytz.timezone(POLAND_TIMEZONE)
+        # Fajr and Maghrib minutes per day from the first day, keyed by (location cell, method, school)
+        self._tables: Dict[Hashable, array] = {}
+        # Rendered messages keyed by (city, date, method, school)
+        self._messages: Dict[Hashable, str] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether Ramadan dates are configured"""
+        return self.first_day is not None and self.last_day is not None
+
+    def is_active(self, day: date_type) -> bool:
+        """Whether a date is a day of fasting"""
+        return self.enabled and self.first_day <= day <= self.last_day
+
+    def day_number(self, day: date_type) -> int:
+        """Day of Ramadan (1-based) for a date inside it"""
+        return (day - self.first_day).days + 1
+
+    def _dates(self) -> List[date_type]:
+        return [
+            self.first_day + timedelta(days=offset)
+            for offset in range((self.last_day - self.first_day).days + 1)
+        ]
+
+    async def _load_table(
+        self,
+        latitude: float,
+        longitude: float,
+        method: int,
+        school: int
+    ) -> array:
+        """
+        Collect Fajr and Maghrib of every Ramadan day from the monthly calendars
+
+        Calendars are read through the disk cache only: the nightly build
+        covers thousands of cells and would flush the in-memory caches.
+        """
+        months = sorted({(day.year, day.month) for day in self._dates()})
+        table = array("H")
+        for year, month in months:
+            calendar = await api.get_monthly_calendar(
+                latitude,
+                longitude,
+                month=month,
+                year=year,
+                method=method,
+                school=school,
+                fill_cache=False
+            )
+            for day in calendar:
+                if self.first_day <= day.date <= self.last_day:
+                    table.append(day.minute_of("Fajr"))
+                    table.append(day.minute_of("Maghrib"))
+        return table
+
+    def _render(
+        self,
+        table: array,
+        day: date_type,
+        city: Optional[str]
+    ) -> str:
+        """Render the compact message of one day from a table"""
+        index = (day - self.first_day).days * 2
+        next_suhoor = None
+        if index + 2 < len(table):
+            next_suhoor = format_minutes(table[index + 2])
+        return formatter.format_ramadan_day(
+            day,
+            self.day_number(day),
+            format_minutes(table[index]),
+            format_minutes(table[index + 1]),
+            city=city,
+            next_suhoor=next_suhoor
+        )
+
+    async def precompute(self) -> int:
+        """
+        Build tables for all cities and hot cells and pre-render city messages
+
+        Cities get tables for the most requested settings; the (much more
+        numerous) hot cells get the default settings only, other settings
+        there fall back to one cached monthly calendar per cell.
+
+        Returns:
+            Number of tables built
+        """
+        if not self.enabled:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        targets: Dict[Tuple[int, int], Tuple[Tuple[float, float], Optional[str]]] = {}
+        for city, coordinates in POLISH_CITIES.items():
+            targets[location_cell(*coordinates)] = (coordinates, city)
+        city_cells = set(targets)
+        for cell in api.hot_cells(self.hot_cells, exclude=city_cells):
+            targets[cell] = (cell_center(cell), None)
+        settings = api.popular_settings(self.top_methods)
+        default_settings = [(api.method, api.school)]
+        days_count = (self.last_day - self.first_day).days + 1
+
+        tables: Dict[Hashable, array] = {}
+        messages: Dict[Hashable, str] = {}
+
+        async def build(cell: Tuple[int, int], method: int, school: int) -> None:
+            (latitude, longitude), city = targets[cell]
+            async with semaphore:
+                try:
+                    table = await self._load_table(latitude, longitude, method, school)
+                except AlAdhanAPIError as e:
+                    logger.warning(f"Ramadan table failed for {city or cell} (method {method}): {e}")
+                    return
+            if len(table) != days_count * 2:
+                logger.warning(f"Ramadan table incomplete for {city or cell} (method {method})")
+                return
+
+            tables[(cell, method, school)] = table
+            if city is not None:
+                for day in self._dates():
+                    messages[(city, day, method, school)] = self._render(table, day, city)
+
+        await asyncio.gather(*(
+            build(cell, method, school)
+            for cell in targets
+            for method, school in (settings if cell in city_cells else default_settings)
+        ))
+
+        # Swap in complete results so readers never see a half-built set
+        self._tables = tables
+        self._messages = messages
+        logger.info(
+            f"Ramadan tables ready: {len(tables)} tables, {len(messages)} city messages "
+            f"({self.first_day} - {self.last_day})"
+        )
+        return len(tables)
+
+    async def get_message(
+        self,
+        latitude: float,
+        longitude: float,
+        day: date_type,
+        city: Optional[str] = None,
+        method: Optional[int] = None,
+        school: Optional[int] = None
+    ) -> str:
+        """
+        Get the suhoor/iftar message of a Ramadan day
+
+        Pre-rendered city messages and precomputed tables are served without
+        upstream calls; other locations fall back to the cached monthly calendar.
+
+        Args:
+            latitude: Location latitude
+            longitude: Location longitude
+            day: Local date inside Ramadan
+            city: City name (optional)
+            method: Calculation method (default: client default)
+            school: Asr school (default: client default)
+
+        Returns:
+            Formatted message string with HTML markup
+
+        Raises:
+            AlAdhanAPIError: If the location is not precomputed and the request fails
+        """
+        method = api.method if method is None else method
+        school = api.school if school is None else school
+
+        if city is not None:
+            message = self._messages.get((city, day, method, school))
+            if message is not None:
+                metrics.increment("ramadan.prerendered")
+                return message
+
+        table = self._tables.get((location_cell(latitude, longitude), method, school))
+        if table is not None:
+            metrics.increment("ramadan.table")
+            return self._render(table, day, city)
+
+        # One monthly calendar answers today, tomorrow and the rest of the month for this cell
+        metrics.increment("ramadan.fallback")
+        calendar = await api.get_monthly_calendar(
+            latitude,
+            longitude,
+            month=day.month,
+            year=day.year,
+            method=method,
+            school=school
+        )
+        today = calendar.day(day.day)
+        next_suhoor = None
+        if day < self.last_day and day.day < len(calendar):
+            next_suhoor = calendar.day(day.day + 1)["Fajr"]
+        return formatter.format_ramadan_day(
+            day,
+            self.day_number(day),
+            today["Fajr"],
+            today["Maghrib"],
+            city=city,
+            next_suhoor=next_suhoor
+        )
+
+    def _in_prepare_window(self, day: date_type) -> bool:
+        return self.enabled and self.first_day - timedelta(days=self.prepare_days) <= day <= self.last_day
+
+    def _seconds_until_midnight(self) -> float:
+        now = datetime.now(self.timezone)
+        midnight = self.timezone.localize(
+            datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        )
+        return (midnight - now).total_seconds()
+
+    async def run(self) -> None:
+        """Precompute on startup and every night while Ramadan is near or ongoing"""
+        while True:
+            today = datetime.now(self.timezone).date()
+            if self._in_prepare_window(today):
+                try:
+                    await self.precompute()
+                except Exception as e:
+                    logger.error(f"Ramadan precompute error: {e}", exc_info=True)
+            elif self._tables and today > self.last_day:
+                self._tables = {}
+                self._messages = {}
+                logger.info("Ramadan ended, tables released")
+            await asyncio.sleep(self._seconds_until_midnight())
+
+    def start(self) -> None:
+        """Start the precompute loop in the background"""
+        if self._task is None and self.enabled:
+            self._task = asyncio.create_task(self.run())
+            logger.info(f"Ramadan mode scheduled for {self.first_day} - {self.last_day}")
+
+    async def stop(self) -> None:
+        """Stop the background loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Ramadan mode stopped")
+
+
+# Global Ramadan schedule
+ramadan = RamadanSchedule()
@@ -0,0 +1,75 @@
+"""
+Reply Helpers
+Keep the number of Telegram API calls per interaction low
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import InlineKeyboardMarkup, Message
+
+from config import PLACEHOLDER_DELAY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+async def fetch_with_placeholder(
+    work: Awaitable[T],
+    show_placeholder: Callable[[], Awaitable[object]],
+    delay: float = PLACEHOLDER_DELAY_SECONDS
+) -> T:
+    """
+    Await work, showing a placeholder only if it takes longer than delay
+
+    Cache hits finish well within the delay, so they cost no placeholder call.
+
+    Args:
+        work: Awaitable producing the result (e.g. API request)
+        show_placeholder: Callback that sends the "processing" message
+        delay: Seconds to wait before showing the placeholder
+
+    Returns:
+        Result of the work
+    """
+    task = asyncio.ensure_future(work)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=delay)
+        if not done:
+            await show_placeholder()
+        return await task
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+async def edit_if_changed(
+    message: Message,
+    text: str,
+    reply_markup: Optional[InlineKeyboardMarkup] = None
+) -> bool:
+    """
+    Edit message text unless it already shows the same content
+
+    Args:
+        message: Message to edit
+        text: New HTML text
+        reply_markup: Inline keyboard to attach (optional)
+
+    Returns:
+        True if an edit request was sent and applied
+    """
+    if message.html_text == text and message.reply_markup == reply_markup:
+        return False
+
+    try:
+        await message.edit_text(text, parse_mode="HTML", reply_markup=reply_markup)
+    except TelegramBadRequest as e:
+        if "message is not modified" not in str(e):
+            raise
+        logger.debug(f"Skipped unchanged edit of message {message.message_id}")
+        return False
+
+    return True
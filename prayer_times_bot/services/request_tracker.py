@@ -0,0 +1,105 @@
+"""
+Per-chat Request Tracker
+Debounces repeated taps and cancels superseded work for the same chat
+"""
+import asyncio
+import time
+from typing import Awaitable, Dict, Hashable, Tuple, TypeVar
+
+from config import REQUEST_DEBOUNCE_SECONDS
+
+T = TypeVar("T")
+
+# Prune expired debounce entries once the table grows past this size
+_PRUNE_THRESHOLD = 10000
+
+
+class RequestSuperseded(Exception):
+    """Raised when a chat request was cancelled by a newer one"""
+    pass
+
+
+class ChatRequestTracker:
+    """Tracks in-flight work per chat so only the latest request is completed"""
+
+    def __init__(self, debounce_seconds: float = REQUEST_DEBOUNCE_SECONDS):
+        """
+        Initialize tracker
+
+        Args:
+            debounce_seconds: Window in which identical requests are ignored
+        """
+        self.debounce_seconds = debounce_seconds
+        self._recent: Dict[int, Tuple[Hashable, float]] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    def is_duplicate(self, chat_id: int, key: Hashable) -> bool:
+        """
+        Check whether an identical request arrived within the debounce window
+
+        The request is recorded as the latest one for the chat either way.
+
+        Args:
+            chat_id: Telegram chat ID
+            key: Request identity (e.g. callback data)
+
+        Returns:
+            True if the request repeats the previous one and should be dropped
+        """
+        now = time.monotonic()
+        previous = self._recent.get(chat_id)
+        self._recent[chat_id] = (key, now)
+
+        if len(self._recent) > _PRUNE_THRESHOLD:
+            self._prune(now)
+
+        return (
+            previous is not None
+            and previous[0] == key
+            and now - previous[1] < self.debounce_seconds
+        )
+
+    def _prune(self, now: float) -> None:
+        """Drop debounce entries older than the window"""
+        expired = [
+            chat_id for chat_id, (_, seen) in self._recent.items()
+            if now - seen >= self.debounce_seconds
+        ]
+        for chat_id in expired:
+            del self._recent[chat_id]
+
+    async def run(self, chat_id: int, work: Awaitable[T]) -> T:
+        """
+        Run work for a chat, cancelling any previous unfinished work
+
+        Args:
+            chat_id: Telegram chat ID
+            work: Coroutine producing the response
+
+        Returns:
+            Result of the work
+
+        Raises:
+            RequestSuperseded: If a newer request for the chat cancelled this one
+        """
+        previous = self._tasks.get(chat_id)
+        if previous is not None and not previous.done():
+            previous.cancel()
+
+        task = asyncio.ensure_future(work)
+        self._tasks[chat_id] = task
+
+        try:
+            return await task
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if current is not None and current.cancelling():
+                raise
+            raise RequestSuperseded()
+        finally:
+            if self._tasks.get(chat_id) is task:
+                del self._tasks[chat_id]
+
+
+# Global tracker instance
+tracker = ChatRequestTracker()
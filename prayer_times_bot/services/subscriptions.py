@@ -0,0 +1,256 @@
+"""
+Subscription Store
+SQLite-backed list of daily digest subscribers and broadcast progress
+"""
+import asyncio
+import logging
+import sqlite3
+import threading
+from datetime import date as date_type
+from typing import Dict, List, Optional, Tuple
+
+from config import SUBSCRIPTIONS_DB_PATH, CALCULATION_METHOD, ASR_SCHOOL
+from services.cache import location_cell
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS subscribers (
+    chat_id INTEGER PRIMARY KEY,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    city TEXT,
+    method INTEGER NOT NULL DEFAULT {method},
+    school INTEGER NOT NULL DEFAULT {school}
+);
+CREATE TABLE IF NOT EXISTS broadcast_progress (
+    day INTEGER PRIMARY KEY,
+    last_chat_id INTEGER NOT NULL,
+    finished INTEGER NOT NULL DEFAULT 0
+);
+""".format(method=CALCULATION_METHOD, school=ASR_SCHOOL)
+
+# Columns added after the first release, with their definitions for ALTER TABLE
+_ADDED_COLUMNS = {
+    "method": f"INTEGER NOT NULL DEFAULT {CALCULATION_METHOD}",
+    "school": f"INTEGER NOT NULL DEFAULT {ASR_SCHOOL}",
+}
+
+# Subscribers sharing a location cell, city label and settings get the same digest
+GroupKey = Tuple[Tuple[int, int], Optional[str], int, int]
+
+
+class SubscriberGroup:
+    """Subscribers that receive an identical digest message"""
+
+    __slots__ = ("latitude", "longitude", "city", "method", "school", "chat_ids")
+
+    def __init__(
+        self,
+        latitude: float,
+        longitude: float,
+        city: Optional[str],
+        method: int = CALCULATION_METHOD,
+        school: int = ASR_SCHOOL
+    ):
+        """
+        Initialize group
+
+        Args:
+            latitude: Coordinates used to compute the group's timings
+            longitude: Coordinates used to compute the group's timings
+            city: City name shown in the digest (optional)
+            method: Calculation method of the group's timings
+            school: Asr school of the group's timings
+        """
+        self.latitude = latitude
+        self.longitude = longitude
+        self.city = city
+        self.method = method
+        self.school = school
+        self.chat_ids: List[int] = []
+
+
+class SubscriptionStore:
+    """Daily digest subscribers stored in a local SQLite file"""
+
+    def __init__(self, path: str = SUBSCRIPTIONS_DB_PATH):
+        """
+        Initialize store (the database is opened lazily on first use)
+
+        Args:
+            path: SQLite database file path
+        """
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open database and create schema on first use"""
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(subscribers)")}
+            for column, definition in _ADDED_COLUMNS.items():
+                if column not in columns:
+                    connection.execute(f"ALTER TABLE subscribers ADD COLUMN {column} {definition}")
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _execute(self, query: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            connection = self._connect()
+            rows = connection.execute(query, params).fetchall()
+            connection.commit()
+            return rows
+
+    async def subscribe(
+        self,
+        chat_id: int,
+        latitude: float,
+        longitude: float,
+        city: Optional[str] = None,
+        method: int = CALCULATION_METHOD,
+        school: int = ASR_SCHOOL
+    ) -> None:
+        """
+        Add or update a subscriber
+
+        Args:
+            chat_id: Telegram chat ID
+            latitude: Location latitude
+            longitude: Location longitude
+            city: City name (optional)
+            method: Calculation method
+            school: Asr school
+        """
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO subscribers (chat_id, latitude, longitude, city, method, school) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (chat_id, latitude, longitude, city, method, school)
+        )
+
+    async def update_settings(self, chat_id: int, method: int, school: int) -> bool:
+        """
+        Change calculation settings of a subscriber
+
+        Args:
+            chat_id: Telegram chat ID
+            method: Calculation method
+            school: Asr school
+
+        Returns:
+            True if the chat is subscribed
+        """
+        rows = await asyncio.to_thread(
+            self._execute,
+            "UPDATE subscribers SET method = ?, school = ? WHERE chat_id = ? RETURNING chat_id",
+            (method, school, chat_id)
+        )
+        return bool(rows)
+
+    async def unsubscribe(self, chat_id: int) -> bool:
+        """
+        Remove a subscriber
+
+        Args:
+            chat_id: Telegram chat ID
+
+        Returns:
+            True if the chat was subscribed
+        """
+        rows = await asyncio.to_thread(
+            self._execute,
+            "DELETE FROM subscribers WHERE chat_id = ? RETURNING chat_id",
+            (chat_id,)
+        )
+        return bool(rows)
+
+    async def is_subscribed(self, chat_id: int) -> bool:
+        """Check whether a chat is subscribed"""
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT 1 FROM subscribers WHERE chat_id = ?",
+            (chat_id,)
+        )
+        return bool(rows)
+
+    async def groups(self) -> Dict[GroupKey, SubscriberGroup]:
+        """
+        Load all subscribers grouped by location cell, city and calculation settings
+
+        Returns:
+            Mapping of group key to SubscriberGroup, chat IDs in ascending order
+        """
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT chat_id, latitude, longitude, city, method, school "
+            "FROM subscribers ORDER BY chat_id"
+        )
+
+        groups: Dict[GroupKey, SubscriberGroup] = {}
+        for chat_id, latitude, longitude, city, method, school in rows:
+            key = (location_cell(latitude, longitude), city, method, school)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = SubscriberGroup(latitude, longitude, city, method, school)
+            group.chat_ids.append(chat_id)
+        return groups
+
+    async def get_progress(self, day: date_type) -> Tuple[Optional[int], bool]:
+        """
+        Get broadcast checkpoint for a day
+
+        Args:
+            day: Broadcast date
+
+        Returns:
+            Tuple (last handled chat ID, finished flag); (None, False) if not started
+        """
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT last_chat_id, finished FROM broadcast_progress WHERE day = ?",
+            (day.toordinal(),)
+        )
+        if not rows:
+            return None, False
+        return rows[0][0], bool(rows[0][1])
+
+    async def save_progress(self, day: date_type, last_chat_id: int, finished: bool = False) -> None:
+        """
+        Save broadcast checkpoint and drop checkpoints of past days
+
+        Args:
+            day: Broadcast date
+            last_chat_id: Highest chat ID the digest was handled for
+            finished: Whether the broadcast is complete
+        """
+        def save():
+            with self._lock:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT OR REPLACE INTO broadcast_progress (day, last_chat_id, finished) "
+                    "VALUES (?, ?, ?)",
+                    (day.toordinal(), last_chat_id, int(finished))
+                )
+                connection.execute(
+                    "DELETE FROM broadcast_progress WHERE day < ?",
+                    (day.toordinal(),)
+                )
+                connection.commit()
+
+        await asyncio.to_thread(save)
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+# Global subscription store
+subscriptions = SubscriptionStore()
@@ -0,0 +1,103 @@
+"""
+Offline Timezone Resolution
+Maps coordinates to IANA timezones without any API call
+"""
+import logging
+from datetime import date as date_type, datetime
+from typing import Optional
+
+import pytz
+
+from config import CACHE_MAX_ENTRIES, POLAND_TIMEZONE
+from services.cache import LRUCache, location_cell
+
+logger = logging.getLogger(__name__)
+
+# Rough bounding box of Poland, used when the polygon index is unavailable
+_POLAND_BOUNDS = (49.0, 54.9, 14.1, 24.2)  # (min lat, max lat, min lon, max lon)
+
+
+def _fallback_timezone(latitude: float, longitude: float) -> str:
+    """
+    Estimate timezone without polygon data
+
+    Args:
+        latitude: Location latitude
+        longitude: Location longitude
+
+    Returns:
+        POLAND_TIMEZONE inside Poland, otherwise a fixed-offset Etc/GMT zone
+    """
+    min_lat, max_lat, min_lon, max_lon = _POLAND_BOUNDS
+    if min_lat <= latitude <= max_lat and min_lon <= longitude <= max_lon:
+        return POLAND_TIMEZONE
+
+    offset = round(longitude / 15)
+    if offset == 0:
+        return "Etc/GMT"
+    # Etc zones use inverted signs: UTC+2 is "Etc/GMT-2"
+    return f"Etc/GMT{-offset:+d}"
+
+
+class TimezoneResolver:
+    """Resolves timezones from a lazily loaded offline polygon index"""
+
+    def __init__(self):
+        self._finder = None
+        self._finder_loaded = False
+        # Resolved timezone names keyed by location cell
+        self._cells = LRUCache(CACHE_MAX_ENTRIES)
+
+    def _get_finder(self):
+        """Load the polygon index on first use (optional dependency)"""
+        if not self._finder_loaded:
+            self._finder_loaded = True
+            try:
+                from timezonefinder import TimezoneFinder
+                self._finder = TimezoneFinder()
+                logger.info("Timezone index loaded")
+            except ImportError:
+                logger.warning("timezonefinder not installed, using approximate timezones")
+        return self._finder
+
+    def timezone_name(self, latitude: float, longitude: float) -> str:
+        """
+        Get IANA timezone name for coordinates
+
+        Args:
+            latitude: Location latitude
+            longitude: Location longitude
+
+        Returns:
+            Timezone name, e.g. "Europe/Warsaw"
+        """
+        cell = location_cell(latitude, longitude)
+        name = self._cells.get(cell)
+        if name is not None:
+            return name
+
+        name: Optional[str] = None
+        finder = self._get_finder()
+        if finder is not None:
+            name = finder.timezone_at(lat=latitude, lng=longitude)
+        if name is None:
+            name = _fallback_timezone(latitude, longitude)
+
+        self._cells.set(cell, name)
+        return name
+
+    def timezone(self, latitude: float, longitude: float) -> pytz.BaseTzInfo:
+        """Get tzinfo for coordinates"""
+        return pytz.timezone(self.timezone_name(latitude, longitude))
+
+    def local_now(self, latitude: float, longitude: float) -> datetime:
+        """Get current local time at coordinates"""
+        return datetime.now(self.timezone(latitude, longitude))
+
+    def local_today(self, latitude: float, longitude: float) -> date_type:
+        """Get current local date at coordinates"""
+        return self.local_now(latitude, longitude).date()
+
+
+# Global timezone resolver
+timezones = TimezoneResolver()
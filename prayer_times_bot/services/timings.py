@@ -0,0 +1,269 @@
+"""
+Typed Prayer Timings Model
+Compact minute-based representation shared by the API client, caches and formatter
+"""
+from array import array
+from bisect import bisect_right
+from datetime import date as date_type, datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Fixed prayer order used for every minutes array
+PRAYER_ORDER = ("Fajr", "Sunrise", "Dhuhr", "Asr", "Maghrib", "Isha")
+PRAYER_INDEX = {name: index for index, name in enumerate(PRAYER_ORDER)}
+PRAYERS_PER_DAY = len(PRAYER_ORDER)
+
+# Sunrise marks the end of Fajr time, not a prayer: it is shown in schedules
+# but never reported as the next prayer or exported as an event
+PRAYERS = tuple(prayer for prayer in PRAYER_ORDER if prayer != "Sunrise")
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def parse_time(value: str) -> int:
+    """
+    Parse AlAdhan time string into minutes since midnight
+
+    Args:
+        value: Time string like "05:12" or "05:12 (CET)"
+
+    Returns:
+        Minutes since midnight
+    """
+    hours, minutes = value.split(" ", 1)[0].split(":", 1)
+    return int(hours) * 60 + int(minutes)
+
+
+def format_minutes(minutes: int) -> str:
+    """
+    Format minutes since midnight as HH:MM
+
+    Args:
+        minutes: Minutes since midnight (values past midnight wrap around)
+
+    Returns:
+        Time string in HH:MM format
+    """
+    hours, minutes = divmod(minutes % MINUTES_PER_DAY, 60)
+    return f"{hours:02d}:{minutes:02d}"
+
+
+def _parse_day_minutes(timings: Dict[str, str]) -> List[int]:
+    """
+    Convert API timings dictionary into a monotonic list of minutes
+
+    Prayers that fall past midnight (e.g. Isha at high latitudes in summer)
+    are shifted by a full day so the sequence stays sorted for bisection.
+    """
+    values = []
+    previous = 0
+    for prayer in PRAYER_ORDER:
+        minutes = parse_time(timings[prayer])
+        while minutes < previous:
+            minutes += MINUTES_PER_DAY
+        values.append(minutes)
+        previous = minutes
+    return values
+
+
+def _parse_api_date(value: str) -> date_type:
+    """Parse DD-MM-YYYY date string returned by AlAdhan API"""
+    return datetime.strptime(value, "%d-%m-%Y").date()
+
+
+class DayTimings:
+    """Prayer times for a single day stored as sorted minutes in PRAYER_ORDER"""
+
+    __slots__ = ("date", "minutes")
+
+    def __init__(self, date: date_type, minutes: array):
+        """
+        Initialize day timings
+
+        Args:
+            date: Gregorian date of the timings
+            minutes: array('H') of minutes since midnight in PRAYER_ORDER
+        """
+        self.date = date
+        self.minutes = minutes
+
+    @classmethod
+    def from_api(cls, timings: Dict[str, str], date: date_type) -> "DayTimings":
+        """
+        Build day timings from AlAdhan timings dictionary
+
+        Args:
+            timings: Prayer times dictionary from AlAdhan API
+            date: Gregorian date of the timings
+
+        Returns:
+            DayTimings instance
+        """
+        return cls(date, array("H", _parse_day_minutes(timings)))
+
+    @classmethod
+    def from_api_day(cls, day_data: Dict) -> "DayTimings":
+        """
+        Build day timings from a full AlAdhan day object (timings + date)
+
+        Args:
+            day_data: Day object with "timings" and "date" keys
+
+        Returns:
+            DayTimings instance
+        """
+        day = _parse_api_date(day_data["date"]["gregorian"]["date"])
+        return cls.from_api(day_data["timings"], day)
+
+    def minute_of(self, prayer: str) -> int:
+        """Get prayer time in minutes since midnight (may exceed one day)"""
+        return self.minutes[PRAYER_INDEX[prayer]]
+
+    def __getitem__(self, prayer: str) -> str:
+        """Get prayer time formatted as HH:MM"""
+        return format_minutes(self.minute_of(prayer))
+
+    def __contains__(self, prayer: str) -> bool:
+        return prayer in PRAYER_INDEX
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """Iterate over (prayer, HH:MM) pairs in PRAYER_ORDER"""
+        for prayer, minutes in zip(PRAYER_ORDER, self.minutes):
+            yield prayer, format_minutes(minutes)
+
+    def next_prayer(self, minute: int) -> Optional[Tuple[str, int]]:
+        """
+        Find the first prayer strictly after the given minute of this day
+
+        Sunrise is skipped, see PRAYERS.
+
+        Args:
+            minute: Minutes since midnight
+
+        Returns:
+            Tuple (prayer, minutes) or None if all prayers have passed
+        """
+        index = bisect_right(self.minutes, minute)
+        while index < PRAYERS_PER_DAY and PRAYER_ORDER[index] not in PRAYERS:
+            index += 1
+        if index == PRAYERS_PER_DAY:
+            return None
+        return PRAYER_ORDER[index], self.minutes[index]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DayTimings):
+            return NotImplemented
+        return self.date == other.date and self.minutes == other.minutes
+
+    def __repr__(self) -> str:
+        times = ", ".join(f"{prayer}={time}" for prayer, time in self.items())
+        return f"DayTimings({self.date.isoformat()}: {times})"
+
+
+def find_next_prayer(
+    today: DayTimings,
+    tomorrow: Optional[DayTimings],
+    minute: int
+) -> Optional[Tuple[str, int]]:
+    """
+    Find the next prayer after a moment of today
+
+    Args:
+        today: Timings of the current day
+        tomorrow: Timings of the next day (needed after the last prayer of today)
+        minute: Current minutes since midnight
+
+    Returns:
+        Tuple (prayer, minutes remaining) or None if tomorrow is needed but missing
+    """
+    upcoming = today.next_prayer(minute)
+    if upcoming is not None:
+        prayer, at = upcoming
+        return prayer, at - minute
+
+    if tomorrow is None:
+        return None
+    return PRAYER_ORDER[0], tomorrow.minutes[0] + MINUTES_PER_DAY - minute
+
+
+class MonthTimings:
+    """Prayer times for a whole month stored in one flat minutes array"""
+
+    __slots__ = ("year", "month", "minutes")
+
+    def __init__(self, year: int, month: int, minutes: array):
+        """
+        Initialize month timings
+
+        Args:
+            year: Gregorian year
+            month: Gregorian month number
+            minutes: array('H') with PRAYERS_PER_DAY entries per day, day 1 first
+        """
+        self.year = year
+        self.month = month
+        self.minutes = minutes
+
+    @classmethod
+    def from_api(cls, year: int, month: int, calendar_data: List[Dict]) -> "MonthTimings":
+        """
+        Build month timings from AlAdhan calendar response
+
+        Args:
+            year: Gregorian year
+            month: Gregorian month number
+            calendar_data: List of daily prayer times from AlAdhan API
+
+        Returns:
+            MonthTimings instance
+        """
+        days = sorted(
+            calendar_data,
+            key=lambda day_data: int(day_data["date"]["gregorian"]["day"])
+        )
+        minutes = array("H")
+        for day_data in days:
+            minutes.extend(_parse_day_minutes(day_data["timings"]))
+        return cls(year, month, minutes)
+
+    def __len__(self) -> int:
+        """Number of days in the month"""
+        return len(self.minutes) // PRAYERS_PER_DAY
+
+    def day(self, day: int) -> DayTimings:
+        """
+        Get timings for a day of the month
+
+        Args:
+            day: Day of month (1-based)
+
+        Returns:
+            DayTimings instance
+        """
+        if not 1 <= day <= len(self):
+            raise IndexError(f"Day {day} out of range for {self.month:02d}.{self.year}")
+        start = (day - 1) * PRAYERS_PER_DAY
+        return DayTimings(
+            date_type(self.year, self.month, day),
+            self.minutes[start:start + PRAYERS_PER_DAY]
+        )
+
+    def days(self, start: int = 1, count: Optional[int] = None) -> List[DayTimings]:
+        """
+        Get a range of days
+
+        Args:
+            start: First day of month (1-based)
+            count: Number of days (default: until end of month)
+
+        Returns:
+            List of DayTimings
+        """
+        end = len(self) if count is None else min(len(self), start + count - 1)
+        return [self.day(day) for day in range(start, end + 1)]
+
+    def __iter__(self) -> Iterator[DayTimings]:
+        for day in range(1, len(self) + 1):
+            yield self.day(day)
+
+    def __repr__(self) -> str:
+        return f"MonthTimings({self.month:02d}.{self.year}, {len(self)} days)"
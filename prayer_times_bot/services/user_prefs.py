@@ -0,0 +1,231 @@
+"""
+User Preferences Store
+Remembers each user's last location and calculation settings
+"""
+import asyncio
+import logging
+import sqlite3
+import threading
+from typing import Dict, Optional, Tuple
+
+from config import USER_PREFS_DB_PATH, CALCULATION_METHOD, ASR_SCHOOL
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_prefs (
+    user_id INTEGER PRIMARY KEY,
+    latitude REAL,
+    longitude REAL,
+    city TEXT,
+    method INTEGER NOT NULL,
+    school INTEGER NOT NULL
+)
+"""
+
+
+class UserPreferences:
+    """Preferences of a single user"""
+
+    __slots__ = ("latitude", "longitude", "city", "method", "school")
+
+    def __init__(
+        self,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        city: Optional[str] = None,
+        method: int = CALCULATION_METHOD,
+        school: int = ASR_SCHOOL
+    ):
+        """
+        Initialize preferences
+
+        Args:
+            latitude: Last location latitude (optional)
+            longitude: Last location longitude (optional)
+            city: City name if the location was picked from the list
+            method: Calculation method
+            school: Asr school
+        """
+        self.latitude = latitude
+        self.longitude = longitude
+        self.city = city
+        self.method = method
+        self.school = school
+
+    @property
+    def has_location(self) -> bool:
+        """Whether the user has chosen a city or shared a location"""
+        return self.latitude is not None and self.longitude is not None
+
+
+class PreferencesStore:
+    """
+    User preferences keyed by Telegram user ID
+
+    Reads are served from memory; changes are written through to a
+    SQLite file so settings survive restarts (empty path keeps them in memory).
+    """
+
+    def __init__(self, path: str = USER_PREFS_DB_PATH):
+        """
+        Initialize store
+
+        Args:
+            path: SQLite database file path
+        """
+        self.path = path
+        self._prefs: Dict[int, UserPreferences] = {}
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open database and create schema on first use"""
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(_SCHEMA)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _load_rows(self) -> list:
+        with self._lock:
+            return self._connect().execute(
+                "SELECT user_id, latitude, longitude, city, method, school FROM user_prefs"
+            ).fetchall()
+
+    def _write(self, user_id: int, prefs: UserPreferences) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO user_prefs "
+                "(user_id, latitude, longitude, city, method, school) VALUES (?, ?, ?, ?, ?, ?)",
+                (user_id, prefs.latitude, prefs.longitude, prefs.city, prefs.method, prefs.school)
+            )
+            connection.commit()
+
+    async def load(self) -> None:
+        """Load all stored preferences into memory (call once on startup)"""
+        if not self.path:
+            return
+        try:
+            rows = await asyncio.to_thread(self._load_rows)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to load user preferences: {e}")
+            return
+
+        for user_id, latitude, longitude, city, method, school in rows:
+            self._prefs[user_id] = UserPreferences(latitude, longitude, city, method, school)
+        logger.info(f"Loaded preferences of {len(rows)} users")
+
+    async def _save(self, user_id: int, prefs: UserPreferences) -> None:
+        """Write preferences through to disk, keeping memory authoritative on errors"""
+        if not self.path:
+            return
+        try:
+            await asyncio.to_thread(self._write, user_id, prefs)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to save preferences of user {user_id}: {e}")
+
+    def get(self, user_id: int) -> Optional[UserPreferences]:
+        """
+        Get preferences of a user
+
+        Args:
+            user_id: Telegram user ID
+
+        Returns:
+            UserPreferences or None if the user has not set anything yet
+        """
+        return self._prefs.get(user_id)
+
+    def get_settings(self, user_id: int) -> Tuple[int, int]:
+        """
+        Get calculation settings of a user
+
+        Args:
+            user_id: Telegram user ID
+
+        Returns:
+            Tuple (method, school), defaults if the user has not chosen
+        """
+        prefs = self._prefs.get(user_id)
+        if prefs is None:
+            return CALCULATION_METHOD, ASR_SCHOOL
+        return prefs.method, prefs.school
+
+    def _get_or_create(self, user_id: int) -> UserPreferences:
+        prefs = self._prefs.get(user_id)
+        if prefs is None:
+            prefs = self._prefs[user_id] = UserPreferences()
+        return prefs
+
+    async def set_location(
+        self,
+        user_id: int,
+        latitude: float,
+        longitude: float,
+        city: Optional[str] = None
+    ) -> UserPreferences:
+        """
+        Remember the user's location
+
+        Args:
+            user_id: Telegram user ID
+            latitude: Location latitude
+            longitude: Location longitude
+            city: City name (optional)
+
+        Returns:
+            Updated UserPreferences
+        """
+        prefs = self._get_or_create(user_id)
+        prefs.latitude = latitude
+        prefs.longitude = longitude
+        prefs.city = city
+        await self._save(user_id, prefs)
+        return prefs
+
+    async def set_method(self, user_id: int, method: int) -> UserPreferences:
+        """
+        Remember the user's calculation method
+
+        Args:
+            user_id: Telegram user ID
+            method: AlAdhan calculation method ID
+
+        Returns:
+            Updated UserPreferences
+        """
+        prefs = self._get_or_create(user_id)
+        prefs.method = method
+        await self._save(user_id, prefs)
+        return prefs
+
+    async def set_school(self, user_id: int, school: int) -> UserPreferences:
+        """
+        Remember the user's Asr school
+
+        Args:
+            user_id: Telegram user ID
+            school: AlAdhan school ID (0 = Standard, 1 = Hanafi)
+
+        Returns:
+            Updated UserPreferences
+        """
+        prefs = self._get_or_create(user_id)
+        prefs.school = school
+        await self._save(user_id, prefs)
+        return prefs
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+# Global preferences store
+user_prefs = PreferencesStore()
@@ -0,0 +1,183 @@
+"""
+Cache Warmer Service
+Prefetches calendars for configured cities and hot locations
+in the most requested calculation settings on startup and shortly before local midnight
+"""
+import asyncio
+import logging
+import random
+from datetime import date as date_type, datetime, timedelta
+from typing import List, Optional, Set, Tuple
+
+import pytz
+
+from config import (
+    POLISH_CITIES,
+    POLAND_TIMEZONE,
+    WARMER_CONCURRENCY,
+    WARMER_JITTER_SECONDS,
+    WARMER_HOT_CELLS,
+    WARMER_TOP_METHODS,
+    WARMER_LEAD_MINUTES,
+)
+from services.aladhan_api import api, AlAdhanAPIError
+from services.cache import cell_center
+
+logger = logging.getLogger(__name__)
+
+
+def _next_month(year: int, month: int) -> Tuple[int, int]:
+    """Get (year, month) following the given month"""
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+class CacheWarmer:
+    """Background task keeping today's and tomorrow's timings cached"""
+
+    def __init__(
+        self,
+        concurrency: int = WARMER_CONCURRENCY,
+        jitter: float = WARMER_JITTER_SECONDS,
+        hot_cells: int = WARMER_HOT_CELLS,
+        top_methods: int = WARMER_TOP_METHODS,
+        lead_minutes: int = WARMER_LEAD_MINUTES
+    ):
+        """
+        Initialize warmer
+
+        Args:
+            concurrency: Maximum simultaneous upstream requests
+            jitter: Maximum random delay before each request, in seconds
+            hot_cells: Number of most requested location cells to warm
+            top_methods: Number of most requested (method, school) pairs to warm
+            lead_minutes: How long before local midnight to run the nightly warm-up
+        """
+        self.concurrency = concurrency
+        self.jitter = jitter
+        self.hot_cells = hot_cells
+        self.top_methods = top_methods
+        self.lead_minutes = lead_minutes
+        self.timezone = pytz.timezone(POLAND_TIMEZONE)
+        self._task: Optional[asyncio.Task] = None
+
+    def _targets(self) -> List[Tuple[float, float]]:
+        """Collect coordinates of all cities and hot location cells"""
+        targets = list(POLISH_CITIES.values())
+        targets.extend(cell_center(cell) for cell in api.hot_cells(self.hot_cells))
+        return targets
+
+    @staticmethod
+    def _months(today: date_type) -> Set[Tuple[int, int]]:
+        """Months covering today, tomorrow and the next month"""
+        tomorrow = today + timedelta(days=1)
+        return {
+            (today.year, today.month),
+            (tomorrow.year, tomorrow.month),
+            _next_month(today.year, today.month),
+        }
+
+    async def warm(self, today: Optional[date_type] = None) -> int:
+        """
+        Load calendars for every target so daily lookups are cache hits
+
+        Args:
+            today: Local date to warm around (default: today in POLAND_TIMEZONE)
+
+        Returns:
+            Number of calendars loaded successfully
+        """
+        if today is None:
+            today = datetime.now(self.timezone).date()
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        months = sorted(self._months(today))
+
+        settings = api.popular_settings(self.top_methods)
+
+        async def load(
+            latitude: float,
+            longitude: float,
+            year: int,
+            month: int,
+            method: int,
+            school: int
+        ) -> bool:
+            async with semaphore:
+                # Spread requests out so the warm-up doesn't burst the upstream
+                await asyncio.sleep(random.uniform(0, self.jitter))
+                try:
+                    await api.get_monthly_calendar(
+                        latitude,
+                        longitude,
+                        month=month,
+                        year=year,
+                        method=method,
+                        school=school
+                    )
+                    return True
+                except AlAdhanAPIError as e:
+                    logger.warning(
+                        f"Cache warm-up failed for {latitude}, {longitude} {month:02d}.{year} "
+                        f"(method {method}, school {school}): {e}"
+                    )
+                    return False
+
+        jobs = [
+            load(latitude, longitude, year, month, method, school)
+            for latitude, longitude in self._targets()
+            for year, month in months
+            for method, school in settings
+        ]
+        results = await asyncio.gather(*jobs)
+        loaded = sum(results)
+
+        logger.info(f"Cache warm-up done: {loaded}/{len(jobs)} calendars loaded")
+        return loaded
+
+    def _seconds_until_next_run(self) -> float:
+        """Seconds until lead_minutes before the next local midnight"""
+        now = datetime.now(self.timezone)
+        midnight = self.timezone.localize(
+            datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        )
+        run_at = midnight - timedelta(minutes=self.lead_minutes)
+        if run_at <= now:
+            run_at += timedelta(days=1)
+        return (run_at - now).total_seconds()
+
+    async def _warm_safely(self, today: Optional[date_type] = None) -> None:
+        """Run warm-up, logging unexpected errors instead of stopping the loop"""
+        try:
+            await self.warm(today)
+        except Exception as e:
+            logger.error(f"Cache warm-up error: {e}", exc_info=True)
+
+    async def run(self) -> None:
+        """Warm on startup, then every night before local midnight"""
+        await self._warm_safely()
+        while True:
+            await asyncio.sleep(self._seconds_until_next_run())
+            # Warm around tomorrow, which starts in a few minutes
+            tomorrow = datetime.now(self.timezone).date() + timedelta(days=1)
+            await self._warm_safely(tomorrow)
+
+    def start(self) -> None:
+        """Start the warmer in the background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+            logger.info("Cache warmer started")
+
+    async def stop(self) -> None:
+        """Stop the background warmer"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Cache warmer stopped")
+
+
+# Global warmer instance
+warmer = CacheWarmer()